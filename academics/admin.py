@@ -1,4 +1,5 @@
 from django.contrib import admin
+from .forms import AcademicYearForm, TermForm
 from .models import (
     Programme, GradeLevel, AcademicYear, Term, Class,
     ClassEnrollment, Subject, ClassSubject
@@ -21,8 +22,16 @@ class GradeLevelAdmin(admin.ModelAdmin):
     ordering = ['order', 'numeric_level']
 
 
+class CurrentFlagAdmin(admin.ModelAdmin):
+    """Admin for models whose form moves the is_current flag (CurrentFlagFormMixin)"""
+
+    def save_model(self, request, obj, form, change):
+        form.save_instance(obj)
+
+
 @admin.register(AcademicYear)
-class AcademicYearAdmin(admin.ModelAdmin):
+class AcademicYearAdmin(CurrentFlagAdmin):
+    form = AcademicYearForm
     list_display = ['name', 'start_date', 'end_date', 'is_current', 'is_active']
     list_filter = ['is_current', 'is_active']
     search_fields = ['name']
@@ -30,20 +39,26 @@ class AcademicYearAdmin(admin.ModelAdmin):
 
 
 @admin.register(Term)
-class TermAdmin(admin.ModelAdmin):
+class TermAdmin(CurrentFlagAdmin):
+    form = TermForm
     list_display = ['name', 'academic_year', 'term_number', 'start_date', 'end_date', 'is_current']
     list_filter = ['academic_year', 'term_number', 'is_current']
     search_fields = ['name', 'academic_year__name']
+    list_select_related = ['academic_year']
     ordering = ['academic_year', 'term_number']
 
 
 @admin.register(Class)
 class ClassAdmin(admin.ModelAdmin):
-    list_display = ['__str__', 'grade_level', 'section', 'programme', 'class_teacher', 'capacity', 'is_active']
+    list_display = [
+        '__str__', 'grade_level', 'section', 'programme', 'class_teacher',
+        'capacity', 'enrollment_count', 'is_active'
+    ]
     list_filter = ['grade_level', 'programme', 'is_active']
     search_fields = ['section', 'grade_level__name', 'class_teacher__first_name', 'class_teacher__last_name']
-    raw_id_fields = ['class_teacher']
-    ordering = ['grade_level__order', 'section']
+    autocomplete_fields = ['class_teacher']
+    list_select_related = ['grade_level', 'programme', 'class_teacher']
+    ordering = ['grade_level_order', 'section']
 
 
 @admin.register(ClassEnrollment)
@@ -51,8 +66,11 @@ class ClassEnrollmentAdmin(admin.ModelAdmin):
     list_display = ['student', 'class_instance', 'academic_year', 'enrollment_date', 'is_active']
     list_filter = ['academic_year', 'class_instance__grade_level', 'is_active']
     search_fields = ['student__first_name', 'student__last_name', 'student__student_id']
-    raw_id_fields = ['student', 'class_instance', 'promoted_from']
-    ordering = ['-academic_year__start_date', 'class_instance__grade_level__order']
+    autocomplete_fields = ['student', 'class_instance', 'promoted_from']
+    list_select_related = [
+        'student', 'class_instance__grade_level', 'class_instance__programme', 'academic_year'
+    ]
+    ordering = ['-academic_year__start_date', 'class_instance__grade_level_order']
 
 
 @admin.register(Subject)
@@ -69,5 +87,8 @@ class ClassSubjectAdmin(admin.ModelAdmin):
     list_display = ['subject', 'class_instance', 'teacher', 'periods_per_week', 'is_active']
     list_filter = ['class_instance__grade_level', 'subject', 'is_active']
     search_fields = ['subject__name', 'class_instance__grade_level__name', 'teacher__first_name', 'teacher__last_name']
-    raw_id_fields = ['teacher']
-    ordering = ['class_instance__grade_level__order', 'subject__name']
+    autocomplete_fields = ['class_instance', 'subject', 'teacher']
+    list_select_related = [
+        'subject', 'class_instance__grade_level', 'class_instance__programme', 'teacher'
+    ]
+    ordering = ['class_instance__grade_level_order', 'subject__name']
@@ -1,11 +1,152 @@
 from django import forms
+from django.core.cache import cache
+from django.db import transaction
 from .models import (
     Programme, GradeLevel, AcademicYear, Term, Class, Subject, ClassSubject,
-    ClassEnrollment
+    ClassEnrollment, ACTIVE_YEAR_PKS_CACHE_KEY, ACTIVE_CLASS_PKS_CACHE_KEY
 )
 from teachers.models import Teacher
 
 
+# Shared widget attributes; widgets copy attrs, so these are safe to reuse
+INPUT_SM = {'class': 'input input-bordered input-sm w-full'}
+SELECT_SM = {'class': 'select select-bordered select-sm w-full'}
+TEXTAREA_SM = {'class': 'textarea textarea-bordered textarea-sm w-full'}
+CHECKBOX = {'class': 'checkbox checkbox-primary checkbox-sm'}
+
+
+def active_year_qs():
+    """Active academic years, resolved from a cached list of primary keys"""
+    pks = cache.get_or_set(
+        ACTIVE_YEAR_PKS_CACHE_KEY,
+        lambda: list(AcademicYear.objects.filter(is_active=True).values_list('pk', flat=True)),
+        300
+    )
+    return AcademicYear.objects.filter(pk__in=pks).order_by('-start_date')
+
+
+def active_class_qs():
+    """Active classes, resolved from a cached list of primary keys"""
+    pks = cache.get_or_set(
+        ACTIVE_CLASS_PKS_CACHE_KEY,
+        lambda: list(Class.objects.filter(is_active=True).values_list('pk', flat=True)),
+        300
+    )
+    # Class.__str__ reads grade_level and programme; promotion also checks the
+    # grade level's order and final-level flag
+    return Class.objects.filter(pk__in=pks).select_related(
+        'grade_level', 'programme'
+    ).only(
+        'id', 'section', 'grade_level', 'programme',
+        'grade_level__name', 'grade_level__numeric_level', 'grade_level__order',
+        'grade_level__is_final_level', 'programme__code'
+    )
+
+
+def active_teacher_qs():
+    """Active teachers with only the columns Teacher.__str__ needs"""
+    return Teacher.objects.filter(is_active=True).only(
+        'user', 'first_name', 'middle_name', 'last_name', 'staff_id'
+    )
+
+
+class ValuesModelChoiceIterator(forms.models.ModelChoiceIterator):
+    """Builds choices from values_list() rows instead of model instances"""
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        rows = self.queryset.values_list('pk', *self.field.label_fields)
+        for pk, *values in rows.iterator():
+            yield (pk, self.field.label_from_values(*values))
+
+
+class FastModelChoiceField(forms.ModelChoiceField):
+    """
+    ModelChoiceField whose options are rendered from label_fields columns,
+    so large dropdowns never instantiate a model per option.
+    """
+    iterator = ValuesModelChoiceIterator
+    label_fields = ()
+
+    def label_from_values(self, *values):
+        """Label an option with its non-empty label_fields values, space separated"""
+        return ' '.join(str(value) for value in values if value not in (None, ''))
+
+
+class TeacherChoiceField(FastModelChoiceField):
+    """Teacher dropdown labelled like Teacher.__str__"""
+    label_fields = ('first_name', 'middle_name', 'last_name', 'staff_id')
+
+    def label_from_values(self, first_name, middle_name, last_name, staff_id):
+        if middle_name:
+            return f"{first_name} {middle_name} {last_name} - {staff_id}"
+        return f"{first_name} {last_name} - {staff_id}"
+
+
+class ClassChoiceField(FastModelChoiceField):
+    """Class dropdown labelled like Class.__str__"""
+    label_fields = (
+        'grade_level__name', 'grade_level__numeric_level',
+        'programme', 'programme__code', 'section'
+    )
+
+    def label_from_values(self, grade_level_name, numeric_level, programme, programme_code, section):
+        if programme is not None:
+            return f"{numeric_level} {programme_code}-{section}"
+        if section:
+            return f"{numeric_level} {section}"
+        return grade_level_name
+
+
+class StudentChoiceField(FastModelChoiceField):
+    """Student dropdown labelled like Student.__str__"""
+    label_fields = ('first_name', 'middle_name', 'last_name', 'student_id')
+
+    def label_from_values(self, first_name, middle_name, last_name, student_id):
+        if middle_name:
+            return f"{first_name} {middle_name} {last_name} - {student_id}"
+        return f"{first_name} {last_name} - {student_id}"
+
+
+class CurrentFlagFormMixin:
+    """
+    Saves models with a single-row is_current flag (AcademicYear, Term).
+    Switching the flag on saves the row without it and then hands over to
+    the model's set_current(), which demotes the previous current row and
+    clears the caches once the transaction commits.
+    """
+
+    def _get_validation_exclusions(self):
+        # The one-current-row constraint is satisfied by set_current on save
+        exclude = super()._get_validation_exclusions()
+        exclude.add('is_current')
+        return exclude
+
+    def save(self, commit=True):
+        instance = super().save(commit=False)
+        if not commit:
+            return instance
+
+        with transaction.atomic():
+            self.save_instance(instance)
+            self._save_m2m()
+        return instance
+
+    def save_instance(self, instance):
+        """Save the row, moving the is_current flag through set_current()"""
+        # The admin saves via save(commit=False) and its own save_model(),
+        # so it calls this directly (see academics.admin.CurrentFlagAdmin)
+        promote = instance.is_current and 'is_current' in self.changed_data
+        with transaction.atomic():
+            if promote:
+                instance.is_current = False
+            instance.save()
+            if promote:
+                type(instance).set_current(instance.pk)
+                instance.is_current = True
+
+
 class ProgrammeForm(forms.ModelForm):
     """Form for creating and editing programmes"""
 
@@ -14,20 +155,18 @@ class ProgrammeForm(forms.ModelForm):
         fields = ['name', 'code', 'description', 'is_active']
         widgets = {
             'name': forms.TextInput(attrs={
-                'class': 'input input-bordered input-sm w-full',
+                **INPUT_SM,
                 'placeholder': 'e.g., General Science'
             }),
             'code': forms.TextInput(attrs={
-                'class': 'input input-bordered input-sm w-full',
+                **INPUT_SM,
                 'placeholder': 'e.g., SCI'
             }),
             'description': forms.TextInput(attrs={
-                'class': 'input input-bordered input-sm w-full',
+                **INPUT_SM,
                 'placeholder': 'Brief description'
             }),
-            'is_active': forms.CheckboxInput(attrs={
-                'class': 'checkbox checkbox-primary checkbox-sm'
-            }),
+            'is_active': forms.CheckboxInput(attrs=CHECKBOX),
         }
 
 
@@ -39,30 +178,24 @@ class GradeLevelForm(forms.ModelForm):
         fields = ['name', 'code', 'level_type', 'numeric_level', 'order', 'is_active']
         widgets = {
             'name': forms.TextInput(attrs={
-                'class': 'input input-bordered input-sm w-full',
+                **INPUT_SM,
                 'placeholder': 'e.g., Form 1, Primary 3'
             }),
             'code': forms.TextInput(attrs={
-                'class': 'input input-bordered input-sm w-full',
+                **INPUT_SM,
                 'placeholder': 'e.g., F1, P3'
             }),
-            'level_type': forms.Select(attrs={
-                'class': 'select select-bordered select-sm w-full'
-            }),
+            'level_type': forms.Select(attrs=SELECT_SM),
             'numeric_level': forms.NumberInput(attrs={
-                'class': 'input input-bordered input-sm w-full',
+                **INPUT_SM,
                 'min': 1, 'max': 6
             }),
-            'order': forms.NumberInput(attrs={
-                'class': 'input input-bordered input-sm w-full'
-            }),
-            'is_active': forms.CheckboxInput(attrs={
-                'class': 'checkbox checkbox-primary checkbox-sm'
-            }),
+            'order': forms.NumberInput(attrs=INPUT_SM),
+            'is_active': forms.CheckboxInput(attrs=CHECKBOX),
         }
 
 
-class AcademicYearForm(forms.ModelForm):
+class AcademicYearForm(CurrentFlagFormMixin, forms.ModelForm):
     """Form for creating and editing academic years"""
 
     class Meta:
@@ -70,53 +203,41 @@ class AcademicYearForm(forms.ModelForm):
         fields = ['name', 'start_date', 'end_date', 'is_current', 'is_active']
         widgets = {
             'name': forms.TextInput(attrs={
-                'class': 'input input-bordered input-sm w-full',
+                **INPUT_SM,
                 'placeholder': 'e.g., 2024/2025'
             }),
             'start_date': forms.DateInput(attrs={
-                'class': 'input input-bordered input-sm w-full',
+                **INPUT_SM,
                 'type': 'date'
             }),
             'end_date': forms.DateInput(attrs={
-                'class': 'input input-bordered input-sm w-full',
+                **INPUT_SM,
                 'type': 'date'
             }),
-            'is_current': forms.CheckboxInput(attrs={
-                'class': 'checkbox checkbox-primary checkbox-sm'
-            }),
-            'is_active': forms.CheckboxInput(attrs={
-                'class': 'checkbox checkbox-primary checkbox-sm'
-            }),
+            'is_current': forms.CheckboxInput(attrs=CHECKBOX),
+            'is_active': forms.CheckboxInput(attrs=CHECKBOX),
         }
 
 
-class TermForm(forms.ModelForm):
+class TermForm(CurrentFlagFormMixin, forms.ModelForm):
     """Form for creating and editing terms"""
 
     class Meta:
         model = Term
         fields = ['academic_year', 'term_number', 'start_date', 'end_date', 'is_current', 'is_active']
         widgets = {
-            'academic_year': forms.Select(attrs={
-                'class': 'select select-bordered select-sm w-full'
-            }),
-            'term_number': forms.Select(attrs={
-                'class': 'select select-bordered select-sm w-full'
-            }),
+            'academic_year': forms.Select(attrs=SELECT_SM),
+            'term_number': forms.Select(attrs=SELECT_SM),
             'start_date': forms.DateInput(attrs={
-                'class': 'input input-bordered input-sm w-full',
+                **INPUT_SM,
                 'type': 'date'
             }),
             'end_date': forms.DateInput(attrs={
-                'class': 'input input-bordered input-sm w-full',
+                **INPUT_SM,
                 'type': 'date'
             }),
-            'is_current': forms.CheckboxInput(attrs={
-                'class': 'checkbox checkbox-primary checkbox-sm'
-            }),
-            'is_active': forms.CheckboxInput(attrs={
-                'class': 'checkbox checkbox-primary checkbox-sm'
-            }),
+            'is_current': forms.CheckboxInput(attrs=CHECKBOX),
+            'is_active': forms.CheckboxInput(attrs=CHECKBOX),
         }
 
 
@@ -130,40 +251,33 @@ class ClassForm(forms.ModelForm):
             'class_teacher', 'room_number', 'building', 'is_active'
         ]
         widgets = {
-            'grade_level': forms.Select(attrs={
-                'class': 'select select-bordered select-sm w-full'
-            }),
+            'grade_level': forms.Select(attrs=SELECT_SM),
             'section': forms.TextInput(attrs={
-                'class': 'input input-bordered input-sm w-full',
+                **INPUT_SM,
                 'placeholder': 'e.g., A, Gold'
             }),
-            'programme': forms.Select(attrs={
-                'class': 'select select-bordered select-sm w-full'
-            }),
+            'programme': forms.Select(attrs=SELECT_SM),
             'capacity': forms.NumberInput(attrs={
-                'class': 'input input-bordered input-sm w-full',
+                **INPUT_SM,
                 'min': 1
             }),
-            'class_teacher': forms.Select(attrs={
-                'class': 'select select-bordered select-sm w-full'
-            }),
+            'class_teacher': forms.Select(attrs=SELECT_SM),
             'room_number': forms.TextInput(attrs={
-                'class': 'input input-bordered input-sm w-full',
+                **INPUT_SM,
                 'placeholder': 'e.g., Room 101'
             }),
             'building': forms.TextInput(attrs={
-                'class': 'input input-bordered input-sm w-full',
+                **INPUT_SM,
                 'placeholder': 'e.g., Science Block'
             }),
-            'is_active': forms.CheckboxInput(attrs={
-                'class': 'checkbox checkbox-primary checkbox-sm'
-            }),
+            'is_active': forms.CheckboxInput(attrs=CHECKBOX),
         }
+        field_classes = {'class_teacher': TeacherChoiceField}
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # Filter only active teachers
-        self.fields['class_teacher'].queryset = Teacher.objects.filter(is_active=True)
+        self.fields['class_teacher'].queryset = active_teacher_qs()
         self.fields['class_teacher'].required = False
         self.fields['programme'].required = False
 
@@ -175,47 +289,44 @@ class ClassEnrollmentForm(forms.ModelForm):
         model = ClassEnrollment
         fields = ['student', 'class_instance', 'academic_year', 'is_active', 'notes']
         widgets = {
-            'student': forms.Select(attrs={
-                'class': 'select select-bordered select-sm w-full'
-            }),
-            'class_instance': forms.Select(attrs={
-                'class': 'select select-bordered select-sm w-full'
-            }),
-            'academic_year': forms.Select(attrs={
-                'class': 'select select-bordered select-sm w-full'
-            }),
-            'is_active': forms.CheckboxInput(attrs={
-                'class': 'checkbox checkbox-primary checkbox-sm'
-            }),
+            'student': forms.Select(attrs=SELECT_SM),
+            'class_instance': forms.Select(attrs=SELECT_SM),
+            'academic_year': forms.Select(attrs=SELECT_SM),
+            'is_active': forms.CheckboxInput(attrs=CHECKBOX),
             'notes': forms.Textarea(attrs={
-                'class': 'textarea textarea-bordered textarea-sm w-full',
+                **TEXTAREA_SM,
                 'rows': 2,
                 'placeholder': 'Optional notes about this enrollment'
             }),
         }
+        field_classes = {
+            'student': StudentChoiceField,
+            'class_instance': ClassChoiceField,
+        }
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields['class_instance'].queryset = Class.objects.filter(is_active=True)
-        self.fields['academic_year'].queryset = AcademicYear.objects.filter(is_active=True)
+        self.fields['class_instance'].queryset = active_class_qs()
+        self.fields['academic_year'].queryset = active_year_qs()
 
 
 class BulkEnrollmentForm(forms.Form):
     """Form for enrolling multiple students in a class"""
     class_instance = forms.ModelChoiceField(
         queryset=Class.objects.filter(is_active=True),
-        widget=forms.Select(attrs={
-            'class': 'select select-bordered select-sm w-full'
-        }),
+        widget=forms.Select(attrs=SELECT_SM),
         label='Class'
     )
     academic_year = forms.ModelChoiceField(
         queryset=AcademicYear.objects.filter(is_active=True),
-        widget=forms.Select(attrs={
-            'class': 'select select-bordered select-sm w-full'
-        })
+        widget=forms.Select(attrs=SELECT_SM)
     )
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['class_instance'].queryset = active_class_qs()
+        self.fields['academic_year'].queryset = active_year_qs()
+
 
 class SubjectForm(forms.ModelForm):
     """Form for creating and editing subjects"""
@@ -228,21 +339,19 @@ class SubjectForm(forms.ModelForm):
         ]
         widgets = {
             'name': forms.TextInput(attrs={
-                'class': 'input input-bordered input-sm w-full',
+                **INPUT_SM,
                 'placeholder': 'e.g., Mathematics'
             }),
             'code': forms.TextInput(attrs={
-                'class': 'input input-bordered input-sm w-full',
+                **INPUT_SM,
                 'placeholder': 'e.g., MATH'
             }),
             'description': forms.Textarea(attrs={
-                'class': 'textarea textarea-bordered textarea-sm w-full',
+                **TEXTAREA_SM,
                 'rows': 2,
                 'placeholder': 'Brief description of the subject'
             }),
-            'subject_type': forms.Select(attrs={
-                'class': 'select select-bordered select-sm w-full'
-            }),
+            'subject_type': forms.Select(attrs=SELECT_SM),
             'applicable_levels': forms.SelectMultiple(attrs={
                 'class': 'select select-bordered select-sm w-full h-24'
             }),
@@ -250,14 +359,17 @@ class SubjectForm(forms.ModelForm):
                 'class': 'select select-bordered select-sm w-full h-24'
             }),
             'credit_hours': forms.NumberInput(attrs={
-                'class': 'input input-bordered input-sm w-full',
+                **INPUT_SM,
                 'step': '0.5', 'min': '0.5'
             }),
-            'is_active': forms.CheckboxInput(attrs={
-                'class': 'checkbox checkbox-primary checkbox-sm'
-            }),
+            'is_active': forms.CheckboxInput(attrs=CHECKBOX),
         }
 
+    @transaction.atomic
+    def save(self, commit=True):
+        # Saves the subject and both many-to-many sets in one transaction
+        return super().save(commit)
+
 
 class ClassSubjectForm(forms.ModelForm):
     """Form for assigning subjects to classes with teachers"""
@@ -266,47 +378,43 @@ class ClassSubjectForm(forms.ModelForm):
         model = ClassSubject
         fields = ['class_instance', 'subject', 'teacher', 'periods_per_week', 'is_active']
         widgets = {
-            'class_instance': forms.Select(attrs={
-                'class': 'select select-bordered select-sm w-full'
-            }),
-            'subject': forms.Select(attrs={
-                'class': 'select select-bordered select-sm w-full'
-            }),
-            'teacher': forms.Select(attrs={
-                'class': 'select select-bordered select-sm w-full'
-            }),
+            'class_instance': forms.Select(attrs=SELECT_SM),
+            'subject': forms.Select(attrs=SELECT_SM),
+            'teacher': forms.Select(attrs=SELECT_SM),
             'periods_per_week': forms.NumberInput(attrs={
-                'class': 'input input-bordered input-sm w-full',
+                **INPUT_SM,
                 'min': 1, 'max': 20
             }),
-            'is_active': forms.CheckboxInput(attrs={
-                'class': 'checkbox checkbox-primary checkbox-sm'
-            }),
+            'is_active': forms.CheckboxInput(attrs=CHECKBOX),
+        }
+        field_classes = {
+            'class_instance': ClassChoiceField,
+            'teacher': TeacherChoiceField,
         }
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields['teacher'].queryset = Teacher.objects.filter(is_active=True)
+        self.fields['teacher'].queryset = active_teacher_qs()
         self.fields['teacher'].required = False
-        self.fields['subject'].queryset = Subject.objects.filter(is_active=True)
-        self.fields['class_instance'].queryset = Class.objects.filter(is_active=True)
+        self.fields['subject'].queryset = Subject.objects.filter(is_active=True).only('id', 'name', 'code')
+        self.fields['class_instance'].queryset = active_class_qs()
 
 
 class BulkClassSubjectForm(forms.Form):
     """Form for bulk assigning subjects to a class"""
     class_instance = forms.ModelChoiceField(
         queryset=Class.objects.filter(is_active=True),
-        widget=forms.Select(attrs={
-            'class': 'select select-bordered select-sm w-full'
-        })
+        widget=forms.Select(attrs=SELECT_SM)
     )
     subjects = forms.ModelMultipleChoiceField(
         queryset=Subject.objects.filter(is_active=True),
-        widget=forms.CheckboxSelectMultiple(attrs={
-            'class': 'checkbox checkbox-primary checkbox-sm'
-        })
+        widget=forms.CheckboxSelectMultiple(attrs=CHECKBOX)
     )
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['class_instance'].queryset = active_class_qs()
+
 
 class PromotionForm(forms.Form):
     """Form for promoting/demoting students between classes"""
@@ -321,7 +429,7 @@ class PromotionForm(forms.Form):
     source_academic_year = forms.ModelChoiceField(
         queryset=AcademicYear.objects.filter(is_active=True),
         widget=forms.Select(attrs={
-            'class': 'select select-bordered select-sm w-full',
+            **SELECT_SM,
             'id': 'source_academic_year'
         }),
         label='From Academic Year'
@@ -329,7 +437,7 @@ class PromotionForm(forms.Form):
     source_class = forms.ModelChoiceField(
         queryset=Class.objects.filter(is_active=True),
         widget=forms.Select(attrs={
-            'class': 'select select-bordered select-sm w-full',
+            **SELECT_SM,
             'id': 'source_class'
         }),
         label='From Class'
@@ -337,7 +445,7 @@ class PromotionForm(forms.Form):
     target_academic_year = forms.ModelChoiceField(
         queryset=AcademicYear.objects.filter(is_active=True),
         widget=forms.Select(attrs={
-            'class': 'select select-bordered select-sm w-full',
+            **SELECT_SM,
             'id': 'target_academic_year'
         }),
         label='To Academic Year',
@@ -346,7 +454,7 @@ class PromotionForm(forms.Form):
     target_class = forms.ModelChoiceField(
         queryset=Class.objects.filter(is_active=True),
         widget=forms.Select(attrs={
-            'class': 'select select-bordered select-sm w-full',
+            **SELECT_SM,
             'id': 'target_class'
         }),
         label='To Class',
@@ -355,7 +463,7 @@ class PromotionForm(forms.Form):
     promotion_type = forms.ChoiceField(
         choices=PROMOTION_TYPE_CHOICES,
         widget=forms.Select(attrs={
-            'class': 'select select-bordered select-sm w-full',
+            **SELECT_SM,
             'id': 'promotion_type'
         }),
         initial='promote'
@@ -364,19 +472,27 @@ class PromotionForm(forms.Form):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # Order academic years by most recent first
-        self.fields['source_academic_year'].queryset = AcademicYear.objects.filter(
-            is_active=True
-        ).order_by('-start_date')
-        self.fields['target_academic_year'].queryset = AcademicYear.objects.filter(
-            is_active=True
-        ).order_by('-start_date')
+        self.fields['source_academic_year'].queryset = active_year_qs()
+        self.fields['target_academic_year'].queryset = active_year_qs()
         # Order classes by grade level
-        self.fields['source_class'].queryset = Class.objects.filter(
-            is_active=True
-        ).select_related('grade_level', 'programme').order_by('grade_level__order', 'section')
-        self.fields['target_class'].queryset = Class.objects.filter(
-            is_active=True
-        ).select_related('grade_level', 'programme').order_by('grade_level__order', 'section')
+        self.fields['source_class'].queryset = active_class_qs().order_by(
+            'grade_level_order', 'section'
+        )
+        self.fields['target_class'].queryset = active_class_qs().order_by(
+            'grade_level_order', 'section'
+        )
+        if not self.is_bound:
+            # Source and target fields list the same rows; evaluate each
+            # queryset once and reuse the rendered choices for both
+            for source, target in (
+                ('source_academic_year', 'target_academic_year'),
+                ('source_class', 'target_class'),
+            ):
+                # A comprehension avoids the COUNT that list() triggers via
+                # ModelChoiceIterator.__len__
+                choices = [choice for choice in self.fields[source].choices]
+                self.fields[source].choices = choices
+                self.fields[target].choices = choices
 
     def clean(self):
         cleaned_data = super().clean()
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django_tenants.utils import get_public_schema_name, schema_context
+from schools.models import School
+from academics.models import Class
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored current-year enrollment count of every class'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--schema', help='Only refresh this school schema')
+
+    def handle(self, *args, **options):
+        schools = School.objects.exclude(schema_name=get_public_schema_name())
+        if options['schema']:
+            schools = schools.filter(schema_name=options['schema'])
+
+        for school in schools:
+            with schema_context(school.schema_name):
+                updated = Class.objects.refresh_enrollment_counts()
+            self.stdout.write(self.style.SUCCESS(f'✓ {school.schema_name}: {updated} class(es) refreshed'))
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-16 07:23
+
+from django.db import migrations, models
+
+
+def demote_extra_current_rows(apps, schema_editor):
+    """Keep only the most recent current year/term so the constraints apply cleanly"""
+    AcademicYear = apps.get_model('academics', 'AcademicYear')
+    Term = apps.get_model('academics', 'Term')
+
+    current_year = AcademicYear.objects.filter(is_current=True).order_by('-start_date').first()
+    if current_year:
+        AcademicYear.objects.filter(is_current=True).exclude(pk=current_year.pk).update(is_current=False)
+
+    current_term = Term.objects.filter(is_current=True).order_by('-start_date').first()
+    if current_term:
+        Term.objects.filter(is_current=True).exclude(pk=current_term.pk).update(is_current=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0006_gradelevel_is_final_level'),
+    ]
+
+    operations = [
+        migrations.RunPython(demote_extra_current_rows, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='academicyear',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_current', True)), fields=('is_current',), name='one_current_year'),
+        ),
+        migrations.AddConstraint(
+            model_name='term',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_current', True)), fields=('is_current',), name='one_current_term'),
+        ),
+    ]
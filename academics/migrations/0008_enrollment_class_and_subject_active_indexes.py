@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-16 07:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0007_one_current_year_and_term'),
+        ('students', '0003_student_graduation_date_student_graduation_year_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='classenrollment',
+            index=models.Index(fields=['class_instance', 'is_active'], name='class_enrol_class_i_1a7752_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subject',
+            index=models.Index(fields=['is_active'], name='subjects_is_acti_960049_idx'),
+        ),
+    ]
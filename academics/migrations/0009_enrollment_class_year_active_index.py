@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-16 07:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0008_enrollment_class_and_subject_active_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='classenrollment',
+            name='class_enrol_class_i_a58a88_idx',
+        ),
+        migrations.AddIndex(
+            model_name='classenrollment',
+            index=models.Index(fields=['class_instance', 'academic_year', 'is_active'], name='class_enrol_class_i_eac2e1_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-16 07:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0010_created_at_db_default'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='academicyear',
+            constraint=models.CheckConstraint(condition=models.Q(('start_date__lt', models.F('end_date'))), name='academic_year_dates_ordered', violation_error_message='End date must be after the start date.'),
+        ),
+        migrations.AddConstraint(
+            model_name='term',
+            constraint=models.CheckConstraint(condition=models.Q(('start_date__lt', models.F('end_date'))), name='term_dates_ordered', violation_error_message='End date must be after the start date.'),
+        ),
+    ]
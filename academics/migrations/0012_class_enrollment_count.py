@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-16 07:42
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_enrollment_counts(apps, schema_editor):
+    """Fill enrollment_count with each class's active current-year enrollments"""
+    AcademicYear = apps.get_model('academics', 'AcademicYear')
+    Class = apps.get_model('academics', 'Class')
+    ClassEnrollment = apps.get_model('academics', 'ClassEnrollment')
+
+    current_year = AcademicYear.objects.filter(is_current=True).first()
+    if not current_year:
+        return
+    enrollments = ClassEnrollment.objects.filter(
+        class_instance=OuterRef('pk'),
+        academic_year=current_year,
+        is_active=True
+    ).order_by().values('class_instance').annotate(total=Count('pk')).values('total')
+    Class.objects.update(enrollment_count=Coalesce(Subquery(enrollments), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0011_academic_year_and_term_dates_ordered'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='class',
+            name='enrollment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_enrollment_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-16 07:46
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def populate_grade_level_order(apps, schema_editor):
+    """Copy each class's grade level order onto the class"""
+    Class = apps.get_model('academics', 'Class')
+    GradeLevel = apps.get_model('academics', 'GradeLevel')
+
+    Class.objects.update(grade_level_order=Subquery(
+        GradeLevel.objects.filter(pk=OuterRef('grade_level_id')).values('order')[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0012_class_enrollment_count'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='class',
+            options={'ordering': ['grade_level_order', 'section'], 'verbose_name_plural': 'classes'},
+        ),
+        migrations.AddField(
+            model_name='class',
+            name='grade_level_order',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_grade_level_order, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 08:36
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0013_class_grade_level_order'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='classenrollment',
+            options={'ordering': ['-academic_year__start_date', 'class_instance__grade_level_order'], 'verbose_name': 'Class Enrollment', 'verbose_name_plural': 'Class Enrollments'},
+        ),
+    ]
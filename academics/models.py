@@ -1,6 +1,93 @@
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Now
 from django.core.validators import MinValueValidator, MaxValueValidator
 
+# Cache keys for primary keys of active rows used by form dropdowns
+ACTIVE_YEAR_PKS_CACHE_KEY = 'academics:active_year_pks'
+ACTIVE_CLASS_PKS_CACHE_KEY = 'academics:active_class_pks'
+
+# Cache keys for the current academic year and term rows
+CURRENT_YEAR_CACHE_KEY = 'academics:current_year'
+CURRENT_TERM_CACHE_KEY = 'academics:current_term'
+
+# Cache keys for the full academic year, grade level and term lists
+ACADEMIC_YEARS_CACHE_KEY = 'academics:academic_years'
+GRADE_LEVELS_CACHE_KEY = 'academics:grade_levels'
+TERMS_CACHE_KEY = 'academics:terms'
+
+
+def delete_cache_on_commit(*keys):
+    """Clear cache keys once the current transaction commits"""
+    # Clearing earlier would let a concurrent request re-cache the old rows
+    # until the TTL runs out; outside a transaction this runs at once
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def count_subquery(model, field):
+    """Count rows of model whose field points at the outer row, as a scalar subquery"""
+    # Unlike Count() over joins, several of these in one query do not
+    # multiply each other and need no GROUP BY
+    counts = model.objects.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(
+        total=Count('pk')
+    ).values('total')
+    return Coalesce(Subquery(counts), 0)
+
+
+class CurrentManager(models.Manager):
+    """Manager for models that flag a single row with is_current"""
+    cache_key = None
+
+    def current(self):
+        """Return the cached current row, or None"""
+        # 0 marks "no current row" so that answer is cached as well
+        row = cache.get_or_set(
+            self.cache_key,
+            lambda: self.filter(is_current=True).first() or 0,
+            60
+        )
+        return row or None
+
+    def current_pk(self):
+        """Return the primary key of the current row, or None"""
+        row = self.current()
+        return row.pk if row else None
+
+
+class AcademicYearQuerySet(models.QuerySet):
+    def with_counts(self):
+        """Annotate each year's term and enrollment counts"""
+        return self.annotate(
+            term_count=count_subquery(Term, 'academic_year'),
+            enrollment_count=count_subquery(ClassEnrollment, 'academic_year')
+        )
+
+
+class AcademicYearManager(CurrentManager.from_queryset(AcademicYearQuerySet)):
+    cache_key = CURRENT_YEAR_CACHE_KEY
+
+
+class TermManager(CurrentManager):
+    cache_key = CURRENT_TERM_CACHE_KEY
+
+    def cached_list(self):
+        """All terms with their academic year, newest year first, from the cache"""
+        return cache.get_or_set(
+            TERMS_CACHE_KEY,
+            lambda: list(self.select_related('academic_year').order_by('-academic_year__start_date', 'term_number')),
+            600
+        )
+
+
+class ProgrammeQuerySet(models.QuerySet):
+    def with_counts(self):
+        """Annotate each programme's class and subject counts"""
+        return self.annotate(
+            class_count=count_subquery(Class, 'programme'),
+            subject_count=count_subquery(Subject, 'programmes')
+        )
+
 
 class Programme(models.Model):
     """
@@ -11,9 +98,11 @@ class Programme(models.Model):
     code = models.CharField(max_length=20, unique=True)
     description = models.CharField(max_length=255, blank=True)
     is_active = models.BooleanField(default=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProgrammeQuerySet.as_manager()
+
     class Meta:
         db_table = 'programmes'
         ordering = ['name']
@@ -22,6 +111,12 @@ class Programme(models.Model):
         return self.name
 
 
+class GradeLevelQuerySet(models.QuerySet):
+    def with_class_count(self):
+        """Annotate the number of classes at each level"""
+        return self.annotate(class_count=count_subquery(Class, 'grade_level'))
+
+
 class GradeLevel(models.Model):
     """
     Supports both Basic (Primary 1-6, JHS 1-3) and SHS (Form 1-3) levels
@@ -45,6 +140,8 @@ class GradeLevel(models.Model):
     )
     is_active = models.BooleanField(default=True)
 
+    objects = GradeLevelQuerySet.as_manager()
+
     class Meta:
         db_table = 'grade_levels'
         ordering = ['order', 'numeric_level']
@@ -53,6 +150,20 @@ class GradeLevel(models.Model):
     def __str__(self):
         return self.name
 
+    @transaction.atomic
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        delete_cache_on_commit(GRADE_LEVELS_CACHE_KEY)
+        # Class sorts on its own copy of the order (see Class.grade_level_order)
+        if not adding:
+            self.classes.update(grade_level_order=self.order)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        delete_cache_on_commit(GRADE_LEVELS_CACHE_KEY)
+        return result
+
 
 class AcademicYear(models.Model):
     """
@@ -66,20 +177,58 @@ class AcademicYear(models.Model):
     end_date = models.DateField()
     is_current = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
+
+    objects = AcademicYearManager()
 
     class Meta:
         db_table = 'academic_years'
         ordering = ['-start_date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['is_current'], condition=Q(is_current=True), name='one_current_year'
+            ),
+            models.CheckConstraint(
+                condition=Q(start_date__lt=F('end_date')), name='academic_year_dates_ordered',
+                violation_error_message='End date must be after the start date.'
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    @transaction.atomic
     def save(self, *args, **kwargs):
-        # Ensure only one academic year is current
-        if self.is_current:
-            AcademicYear.objects.filter(is_current=True).exclude(pk=self.pk).update(is_current=False)
+        was_current = self.pk is not None and self.pk == AcademicYear.objects.current_pk()
         super().save(*args, **kwargs)
+        delete_cache_on_commit(
+            ACTIVE_YEAR_PKS_CACHE_KEY, CURRENT_YEAR_CACHE_KEY, ACADEMIC_YEARS_CACHE_KEY, TERMS_CACHE_KEY
+        )
+        # Stored class enrollment counts are for the current year
+        if was_current or self.is_current:
+            Class.objects.refresh_enrollment_counts()
+
+    @transaction.atomic
+    def delete(self, *args, **kwargs):
+        was_current = self.pk == AcademicYear.objects.current_pk()
+        result = super().delete(*args, **kwargs)
+        delete_cache_on_commit(
+            ACTIVE_YEAR_PKS_CACHE_KEY, CURRENT_YEAR_CACHE_KEY, CURRENT_TERM_CACHE_KEY,
+            ACADEMIC_YEARS_CACHE_KEY, TERMS_CACHE_KEY
+        )
+        if was_current:
+            Class.objects.refresh_enrollment_counts()
+        return result
+
+    @classmethod
+    def set_current(cls, pk):
+        """Make the given academic year the only current one"""
+        with transaction.atomic():
+            cls.objects.filter(is_current=True).exclude(pk=pk).update(is_current=False)
+            cls.objects.filter(pk=pk).update(is_current=True)
+            Class.objects.refresh_enrollment_counts()
+            # The cached term list carries each term's academic year, flag included
+            delete_cache_on_commit(CURRENT_YEAR_CACHE_KEY, ACADEMIC_YEARS_CACHE_KEY, TERMS_CACHE_KEY)
 
 
 class Term(models.Model):
@@ -101,10 +250,21 @@ class Term(models.Model):
     is_current = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
 
+    objects = TermManager()
+
     class Meta:
         db_table = 'terms'
         ordering = ['academic_year', 'term_number']
         unique_together = [['academic_year', 'term_number']]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['is_current'], condition=Q(is_current=True), name='one_current_term'
+            ),
+            models.CheckConstraint(
+                condition=Q(start_date__lt=F('end_date')), name='term_dates_ordered',
+                violation_error_message='End date must be after the start date.'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.academic_year.name} - {self.get_term_number_display()}"
@@ -115,10 +275,61 @@ class Term(models.Model):
         return self.get_term_number_display()
 
     def save(self, *args, **kwargs):
-        # Ensure only one term is current
-        if self.is_current:
-            Term.objects.filter(is_current=True).exclude(pk=self.pk).update(is_current=False)
         super().save(*args, **kwargs)
+        delete_cache_on_commit(CURRENT_TERM_CACHE_KEY, TERMS_CACHE_KEY)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        delete_cache_on_commit(CURRENT_TERM_CACHE_KEY, TERMS_CACHE_KEY)
+        return result
+
+    @classmethod
+    def set_current(cls, pk):
+        """Make the given term the only current one"""
+        with transaction.atomic():
+            cls.objects.filter(is_current=True).exclude(pk=pk).update(is_current=False)
+            cls.objects.filter(pk=pk).update(is_current=True)
+            delete_cache_on_commit(CURRENT_TERM_CACHE_KEY, TERMS_CACHE_KEY)
+
+
+class ClassQuerySet(models.QuerySet):
+    """Query helpers for Class"""
+
+    def with_display_fields(self):
+        """Join the relations Class.__str__ and class listings read"""
+        return self.select_related('grade_level', 'programme', 'class_teacher')
+
+    @staticmethod
+    def _enrollment_count(academic_year):
+        """Scalar subquery counting a class's active enrollments for a year"""
+        enrollments = ClassEnrollment.objects.filter(
+            class_instance=OuterRef('pk'),
+            academic_year=academic_year,
+            is_active=True
+        ).order_by().values('class_instance').annotate(total=Count('pk')).values('total')
+        return Coalesce(Subquery(enrollments), 0)
+
+    def refresh_enrollment_counts(self):
+        """Recompute the stored current-year enrollment_count of these classes"""
+        # Read the current year in the same statement rather than through the
+        # cache, which may still hold the year a pending transaction replaces
+        current_year = AcademicYear.objects.filter(is_current=True).values('pk')[:1]
+        return self.update(enrollment_count=self._enrollment_count(current_year))
+
+    def with_enrollment(self, academic_year=None):
+        """Annotate active enrollment counts for a year (defaults to current)"""
+        # A subquery rather than Count() over a join keeps the query free of
+        # GROUP BY, so Meta.ordering still applies and pagination counts stay cheap
+        if academic_year is None:
+            academic_year = AcademicYear.objects.current()
+        return self.annotate(active_enrollment=self._enrollment_count(academic_year))
+
+
+class ClassManager(models.Manager.from_queryset(ClassQuerySet)):
+    """Default manager that always joins the relations Class.__str__ reads"""
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('grade_level', 'programme')
 
 
 class Class(models.Model):
@@ -152,13 +363,23 @@ class Class(models.Model):
     room_number = models.CharField(max_length=20, blank=True)
     building = models.CharField(max_length=50, blank=True)
 
+    # Copy of grade_level.order so the default ordering needs no join;
+    # set in save() and kept in sync by GradeLevel.save()
+    grade_level_order = models.IntegerField(default=0, editable=False)
+
+    # Active enrollments in the current academic year, kept up to date by
+    # ClassEnrollment and AcademicYear writes (see refresh_enrollment_counts)
+    enrollment_count = models.PositiveIntegerField(default=0, editable=False)
+
     is_active = models.BooleanField(default=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
+
+    objects = ClassManager()
 
     class Meta:
         db_table = 'classes'
         verbose_name_plural = 'classes'
-        ordering = ['grade_level__order', 'section']
+        ordering = ['grade_level_order', 'section']
         unique_together = [['grade_level', 'section', 'programme']]
         indexes = [
             models.Index(fields=['grade_level', 'is_active']),
@@ -171,10 +392,44 @@ class Class(models.Model):
             return f"{self.grade_level.numeric_level} {self.section}"
         return self.grade_level.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored grade level so save() can tell whether it changed"""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_grade_level_id = instance.__dict__.get('grade_level_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        # The copied order only changes on insert or a move to another level;
+        # read __dict__ so a deferred grade_level_id is not loaded
+        grade_level_id = self.__dict__.get('grade_level_id')
+        if self._state.adding or grade_level_id != getattr(self, '_loaded_grade_level_id', None):
+            self.grade_level_order = self.grade_level.order
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'grade_level' in update_fields:
+                kwargs['update_fields'] = {*update_fields, 'grade_level_order'}
+        super().save(*args, **kwargs)
+        self._loaded_grade_level_id = self.__dict__.get('grade_level_id')
+        delete_cache_on_commit(ACTIVE_CLASS_PKS_CACHE_KEY)
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        # enrollment_count is only written by refresh_enrollment_counts(), so a
+        # full save of a possibly stale instance leaves it out of the UPDATE;
+        # unlike forcing update_fields, this keeps Django's insert fallback
+        # and its handling of deferred fields
+        if update_fields is None:
+            values = [value for value in values if value[0].name != 'enrollment_count']
+        return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+
     def get_current_enrollment(self, academic_year=None):
         """Get enrollment count for a specific academic year (defaults to current)"""
         if academic_year is None:
-            academic_year = AcademicYear.objects.filter(is_current=True).first()
+            # Reuse the count from ClassQuerySet.with_enrollment() when present,
+            # otherwise the stored current-year count
+            annotated = getattr(self, 'active_enrollment', None)
+            if annotated is not None:
+                return annotated
+            return self.enrollment_count
         if academic_year:
             return self.enrollments.filter(
                 academic_year=academic_year,
@@ -198,6 +453,22 @@ class Class(models.Model):
         return round((self.current_enrollment / self.capacity) * 100, 1)
 
 
+class ClassEnrollmentQuerySet(models.QuerySet):
+    """Query helpers for ClassEnrollment"""
+
+    def roster(self, academic_year):
+        """Active enrollments for a year with students joined, sorted by name"""
+        # Explicit ordering avoids the joins Meta.ordering adds for year/grade level.
+        # Only the columns the class roster renders are loaded from the wide student row
+        return self.filter(academic_year=academic_year, is_active=True).select_related(
+            'student'
+        ).only(
+            'id', 'student', 'class_instance', 'academic_year', 'is_active', 'enrollment_date',
+            'student__student_id', 'student__first_name', 'student__middle_name',
+            'student__last_name', 'student__gender', 'student__residential_status'
+        ).order_by('student__last_name', 'student__first_name')
+
+
 class ClassEnrollment(models.Model):
     """
     Tracks student enrollment in classes per academic year.
@@ -234,30 +505,84 @@ class ClassEnrollment(models.Model):
     )
 
     notes = models.TextField(blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ClassEnrollmentQuerySet.as_manager()
+
     class Meta:
         db_table = 'class_enrollments'
         verbose_name = 'Class Enrollment'
         verbose_name_plural = 'Class Enrollments'
         unique_together = [['student', 'academic_year']]  # One class per student per year
-        ordering = ['-academic_year__start_date', 'class_instance__grade_level__order']
+        ordering = ['-academic_year__start_date', 'class_instance__grade_level_order']
         indexes = [
             models.Index(fields=['academic_year', 'is_active']),
-            models.Index(fields=['class_instance', 'academic_year']),
+            models.Index(fields=['class_instance', 'academic_year', 'is_active']),
+            models.Index(fields=['class_instance', 'is_active']),
             models.Index(fields=['student', 'is_active']),
         ]
 
     def __str__(self):
         return f"{self.student} - {self.class_instance} ({self.academic_year.name})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored placement so save() can tell whether it changed"""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_placement = instance._placement()
+        return instance
+
+    def _placement(self):
+        """The fields that decide the student's current class and class counts"""
+        # Read __dict__ so deferred fields (e.g. in deletion collection) are
+        # not loaded from the database
+        return (
+            self.__dict__.get('class_instance_id'),
+            self.__dict__.get('is_active'),
+            self.__dict__.get('academic_year_id'),
+        )
+
+    @transaction.atomic
     def save(self, *args, **kwargs):
-        # Update student's current_class if this is for the current academic year
+        # Update student's current_class if this is for the current academic year;
+        # compare against the cached current year pk instead of loading the year
+        from students.models import Student
+
+        # Saves that leave the class and active flag unchanged (e.g. editing
+        # notes) have nothing to propagate to the student
+        loaded_placement = getattr(self, '_loaded_placement', None)
+        placement_changed = self._state.adding or self._placement() != loaded_placement
         super().save(*args, **kwargs)
-        if self.academic_year.is_current and self.is_active:
-            self.student.current_class = self.class_instance
-            self.student.save(update_fields=['current_class'])
+        self._loaded_placement = self._placement()
+        if placement_changed:
+            class_pks = {self.class_instance_id}
+            if loaded_placement:
+                class_pks.add(loaded_placement[0])
+            Class.objects.filter(pk__in=class_pks).refresh_enrollment_counts()
+        if (
+            placement_changed and self.is_active
+            and self.academic_year_id == AcademicYear.objects.current_pk()
+        ):
+            Student.objects.filter(pk=self.student_id).update(current_class=self.class_instance_id)
+            if ClassEnrollment.student.is_cached(self):
+                self.student.current_class = self.class_instance
+
+    @transaction.atomic
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        Class.objects.filter(pk=self.class_instance_id).refresh_enrollment_counts()
+        return result
+
+
+class SubjectQuerySet(models.QuerySet):
+    def with_relations(self):
+        """Prefetch the grade levels and programmes a subject is offered to"""
+        return self.prefetch_related('applicable_levels', 'programmes')
+
+    def with_class_count(self):
+        """Annotate the number of classes each subject is taught in"""
+        return self.annotate(class_count=count_subquery(ClassSubject, 'subject'))
 
 
 class Subject(models.Model):
@@ -301,20 +626,33 @@ class Subject(models.Model):
     )
 
     is_active = models.BooleanField(default=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = SubjectQuerySet.as_manager()
+
     class Meta:
         db_table = 'subjects'
         ordering = ['name']
         indexes = [
             models.Index(fields=['subject_type', 'is_active']),
+            models.Index(fields=['is_active']),
         ]
 
     def __str__(self):
         return f"{self.name} ({self.code})"
 
 
+class ClassSubjectQuerySet(models.QuerySet):
+    """Query helpers for ClassSubject"""
+
+    def for_class(self, class_pk):
+        """Active assignments for a class, with subject and teacher joined"""
+        return self.filter(class_instance_id=class_pk, is_active=True).select_related(
+            'subject', 'teacher'
+        )
+
+
 class ClassSubject(models.Model):
     """
     Represents the assignment of a subject to a class with an assigned teacher
@@ -344,7 +682,9 @@ class ClassSubject(models.Model):
     )
 
     is_active = models.BooleanField(default=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
+
+    objects = ClassSubjectQuerySet.as_manager()
 
     class Meta:
         db_table = 'class_subjects'
@@ -1,3 +1,202 @@
-from django.test import TestCase
+from django.contrib import admin
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
 
-# Create your tests here.
+from accounts.models import User
+from schools.tests import SchoolTestCase
+from students.models import Student
+from academics.admin import AcademicYearAdmin
+from academics.forms import TermForm
+from academics.models import (
+    AcademicYear, Class, ClassEnrollment, GradeLevel, Programme, Subject, Term
+)
+
+
+class AcademicsViewQueryTests(SchoolTestCase):
+    """Query counts of the hot academics views must not grow with the data"""
+
+    def setUp(self):
+        """Set up a class in the current year and one to promote into"""
+        super().setUp()
+        self.year = AcademicYear.objects.create(
+            name='2024/2025', start_date='2024-09-01', end_date='2025-07-31', is_current=True
+        )
+        self.next_year = AcademicYear.objects.create(
+            name='2025/2026', start_date='2025-09-01', end_date='2026-07-31'
+        )
+        self.programme = Programme.objects.create(name='General Science', code='SCI')
+        form_1 = GradeLevel.objects.create(name='Form 1', code='F1', level_type='shs', numeric_level=1, order=1)
+        form_2 = GradeLevel.objects.create(name='Form 2', code='F2', level_type='shs', numeric_level=2, order=2)
+        self.source_class = Class.objects.create(grade_level=form_1, section='A', programme=self.programme)
+        self.target_class = Class.objects.create(grade_level=form_2, section='A', programme=self.programme)
+        self.student_count = 0
+
+    def create_students(self, count, enroll=False):
+        """Create active students, optionally enrolled in the source class"""
+        students = []
+        for _ in range(count):
+            self.student_count += 1
+            n = self.student_count
+            user = User.objects.create_user(
+                email=f'student{n}@example.com',
+                role=User.STUDENT,
+                password='testpass'
+            )
+            student = Student.objects.create(
+                user=user,
+                first_name=f'First{n}',
+                last_name=f'Student{n:03d}',
+                student_id=f'STU{n:03d}',
+                date_of_birth='2010-01-01',
+                gender='M',
+                is_active=True
+            )
+            if enroll:
+                ClassEnrollment.objects.create(
+                    student=student, class_instance=self.source_class, academic_year=self.year
+                )
+            students.append(student)
+        return students
+
+    def count_queries(self, method, url, data=None):
+        """Run an HTMX request twice and return the queries of the warm run"""
+        send = getattr(self.client, method)
+        send(url, data, HTTP_HX_REQUEST='true')
+        with CaptureQueriesContext(connection) as queries:
+            response = send(url, data, HTTP_HX_REQUEST='true')
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_promotion_preview_queries_do_not_scale_with_roster(self):
+        """Test that the preview flags every student in the same query"""
+        data = {
+            'source_academic_year': self.year.pk,
+            'source_class': self.source_class.pk,
+            'target_academic_year': self.next_year.pk,
+            'target_class': self.target_class.pk,
+            'promotion_type': 'promote',
+        }
+        url = reverse('academics:promotion_preview')
+
+        self.create_students(2, enroll=True)
+        small = self.count_queries('post', url, data)
+        self.create_students(8, enroll=True)
+        large = self.count_queries('post', url, data)
+
+        self.assertEqual(small, large)
+
+    def test_enrollment_add_queries_do_not_scale_with_students(self):
+        """Test that the student dropdown is built without a query per option"""
+        url = reverse('academics:class_enrollment_add', args=[self.source_class.pk])
+
+        self.create_students(2)
+        small = self.count_queries('get', url)
+        self.create_students(8)
+        large = self.count_queries('get', url)
+
+        self.assertEqual(small, large)
+
+    def test_bulk_enrollment_queries_do_not_scale_with_selection(self):
+        """Test that bulk enrollment inserts every selected student at once"""
+        url = reverse('academics:bulk_enrollment', args=[self.source_class.pk])
+        few = self.create_students(2)
+        many = self.create_students(8)
+        self.client.post(url, {'academic_year': self.year.pk}, HTTP_HX_REQUEST='true')
+
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(url, {'academic_year': self.year.pk, 'students': [s.pk for s in few]},
+                             HTTP_HX_REQUEST='true')
+        with CaptureQueriesContext(connection) as large:
+            self.client.post(url, {'academic_year': self.year.pk, 'students': [s.pk for s in many]},
+                             HTTP_HX_REQUEST='true')
+
+        self.assertEqual(len(small), len(large))
+        self.assertEqual(
+            ClassEnrollment.objects.filter(class_instance=self.source_class, academic_year=self.year).count(),
+            10
+        )
+
+    def test_programme_counts_are_not_multiplied(self):
+        """Test that class and subject counts are counted independently"""
+        Class.objects.create(grade_level=self.source_class.grade_level, section='B', programme=self.programme)
+        for code in ('MTH', 'PHY', 'CHM'):
+            Subject.objects.create(name=code, code=code).programmes.add(self.programme)
+
+        response = self.client.get(reverse('academics:programmes'), HTTP_HX_REQUEST='true')
+        programme = response.context['programmes'].get(pk=self.programme.pk)
+
+        self.assertEqual(programme.class_count, 3)
+        self.assertEqual(programme.subject_count, 3)
+
+
+class CurrentFlagTests(SchoolTestCase):
+    """set_current is the one way a year or term becomes current"""
+
+    def test_set_current_moves_the_flag_and_refreshes_the_cache(self):
+        """Test that set_current demotes the old year and current() sees it once committed"""
+        old = AcademicYear.objects.create(
+            name='2024/2025', start_date='2024-09-01', end_date='2025-07-31', is_current=True
+        )
+        new = AcademicYear.objects.create(
+            name='2025/2026', start_date='2025-09-01', end_date='2026-07-31'
+        )
+        Term.objects.create(academic_year=new, term_number=1, start_date='2025-09-01', end_date='2025-12-15')
+        self.assertEqual(AcademicYear.objects.current_pk(), old.pk)
+        Term.objects.cached_list()
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            AcademicYear.set_current(new.pk)
+            self.assertEqual(list(AcademicYear.objects.filter(is_current=True)), [new])
+            # Until the transaction commits, other requests still see the old year
+            self.assertEqual(AcademicYear.objects.current_pk(), old.pk)
+        for callback in callbacks:
+            callback()
+
+        self.assertEqual(AcademicYear.objects.current_pk(), new.pk)
+        self.assertTrue(Term.objects.cached_list()[0].academic_year.is_current)
+
+    def test_term_form_hands_the_flag_to_set_current(self):
+        """Test that saving a term as current demotes the previous current term"""
+        year = AcademicYear.objects.create(
+            name='2024/2025', start_date='2024-09-01', end_date='2025-07-31', is_current=True
+        )
+        first = Term.objects.create(
+            academic_year=year, term_number=1, start_date='2024-09-01', end_date='2024-12-15', is_current=True
+        )
+        self.assertEqual(Term.objects.current_pk(), first.pk)
+
+        form = TermForm(data={
+            'academic_year': year.pk, 'term_number': 2, 'start_date': '2025-01-06',
+            'end_date': '2025-04-10', 'is_current': True, 'is_active': True,
+        })
+        self.assertTrue(form.is_valid(), form.errors)
+        with self.captureOnCommitCallbacks(execute=True):
+            second = form.save()
+
+        self.assertTrue(second.is_current)
+        self.assertEqual(list(Term.objects.filter(is_current=True)), [second])
+        self.assertEqual(Term.objects.current_pk(), second.pk)
+
+    def test_admin_hands_the_flag_to_set_current(self):
+        """Test that making a year current in the admin demotes the previous one"""
+        old = AcademicYear.objects.create(
+            name='2024/2025', start_date='2024-09-01', end_date='2025-07-31', is_current=True
+        )
+        model_admin = AcademicYearAdmin(AcademicYear, admin.site)
+        request = RequestFactory().post('/')
+        request.user = self.user
+        form = model_admin.get_form(request)(data={
+            'name': '2025/2026', 'start_date': '2025-09-01', 'end_date': '2026-07-31',
+            'is_current': True, 'is_active': True,
+        })
+        self.assertTrue(form.is_valid(), form.errors)
+
+        new = model_admin.save_form(request, form, change=False)
+        with self.captureOnCommitCallbacks(execute=True):
+            model_admin.save_model(request, new, form, change=False)
+
+        self.assertEqual(list(AcademicYear.objects.filter(is_current=True)), [new])
+        self.assertNotEqual(old.pk, new.pk)
+        self.assertEqual(AcademicYear.objects.current_pk(), new.pk)
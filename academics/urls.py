@@ -4,6 +4,12 @@ from . import views
 app_name = 'academics'
 
 urlpatterns = [
+    # Hot HTMX/JSON endpoints first; patterns are tried top-down
+    path('api/classes/<int:class_pk>/students/', views.get_class_students_json, name='api_class_students'),
+    path('api/suggest-target-class/', views.get_suggested_target_class, name='api_suggest_target'),
+    path('classes/partial/', views.class_list_partial_view, name='class_list_partial'),
+    path('subjects/partial/', views.subject_list_partial_view, name='subject_list_partial'),
+
     # Academic Years
     path('academic-years/', views.academic_year_list_view, name='academic_years'),
     path('academic-years/add/', views.academic_year_add_view, name='academic_year_add'),
@@ -29,7 +35,6 @@ urlpatterns = [
 
     # Classes
     path('classes/', views.class_list_view, name='classes'),
-    path('classes/partial/', views.class_list_partial_view, name='class_list_partial'),
     path('classes/add/', views.class_add_view, name='class_add'),
     path('classes/<int:pk>/', views.class_detail_view, name='class_detail'),
     path('classes/<int:pk>/edit/', views.class_edit_view, name='class_edit'),
@@ -47,7 +52,6 @@ urlpatterns = [
 
     # Subjects
     path('subjects/', views.subject_list_view, name='subjects'),
-    path('subjects/partial/', views.subject_list_partial_view, name='subject_list_partial'),
     path('subjects/add/', views.subject_add_view, name='subject_add'),
     path('subjects/<int:pk>/', views.subject_detail_view, name='subject_detail'),
     path('subjects/<int:pk>/edit/', views.subject_edit_view, name='subject_edit'),
@@ -57,6 +61,4 @@ urlpatterns = [
     path('promotion/', views.promotion_view, name='promotion'),
     path('promotion/preview/', views.promotion_preview_view, name='promotion_preview'),
     path('promotion/execute/', views.promotion_execute_view, name='promotion_execute'),
-    path('api/classes/<int:class_pk>/students/', views.get_class_students_json, name='api_class_students'),
-    path('api/suggest-target-class/', views.get_suggested_target_class, name='api_suggest_target'),
 ]
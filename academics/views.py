@@ -1,14 +1,19 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.http import HttpResponse
+from django.template.loader import render_to_string
 from django.contrib import messages
-from django.db.models import Count, Q
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import (
+    BooleanField, Case, Exists, ExpressionWrapper, IntegerField, OuterRef, Prefetch, Q, Value, When
+)
 from django.core.paginator import Paginator
 from django.urls import reverse
 
 from .models import (
     Programme, GradeLevel, AcademicYear, Term, Class, Subject, ClassSubject,
-    ClassEnrollment
+    ClassEnrollment, ACADEMIC_YEARS_CACHE_KEY, GRADE_LEVELS_CACHE_KEY
 )
 from .forms import (
     ProgrammeForm, GradeLevelForm, AcademicYearForm, TermForm,
@@ -17,15 +22,34 @@ from .forms import (
 )
 
 
+def _render_and_close_modal(request, template_name, context):
+    """Render a partial after a successful modal form and close the modal"""
+    response = render(request, template_name, context)
+    response['HX-Trigger'] = 'closeModal'
+    return response
+
+
+def _cached_academic_years():
+    """All academic years for filter dropdowns, cached until a year changes"""
+    return cache.get_or_set(ACADEMIC_YEARS_CACHE_KEY, lambda: list(AcademicYear.objects.all()), 300)
+
+
+def _cached_grade_levels():
+    """All grade levels for filter dropdowns, cached until a level changes"""
+    return cache.get_or_set(GRADE_LEVELS_CACHE_KEY, lambda: list(GradeLevel.objects.all()), 300)
+
+
 # ==================== Academic Year Views ====================
 
+def _annotated_academic_years():
+    """Academic years with the term and enrollment counts the list shows"""
+    return AcademicYear.objects.only('id', 'name', 'start_date', 'end_date', 'is_current').with_counts()
+
+
 @login_required
 def academic_year_list_view(request):
     """List all academic years"""
-    years = AcademicYear.objects.annotate(
-        term_count=Count('terms'),
-        enrollment_count=Count('enrollments')
-    )
+    years = _annotated_academic_years()
 
     breadcrumbs = [
         {'name': 'Dashboard', 'url': reverse('dashboard:main_partial')},
@@ -53,13 +77,8 @@ def academic_year_add_view(request):
             form.save()
             messages.success(request, 'Academic year created successfully.')
             if request.htmx:
-                years = AcademicYear.objects.annotate(
-                    term_count=Count('terms'),
-                    enrollment_count=Count('enrollments')
-                )
-                response = render(request, 'academics/partials/academic_year_list.html', {'years': years})
-                response['HX-Trigger'] = 'closeModal'
-                return response
+                years = _annotated_academic_years()
+                return _render_and_close_modal(request, 'academics/partials/academic_year_list.html', {'years': years})
             return redirect('academics:academic_years')
     else:
         form = AcademicYearForm()
@@ -81,13 +100,8 @@ def academic_year_edit_view(request, pk):
             form.save()
             messages.success(request, 'Academic year updated successfully.')
             if request.htmx:
-                years = AcademicYear.objects.annotate(
-                    term_count=Count('terms'),
-                    enrollment_count=Count('enrollments')
-                )
-                response = render(request, 'academics/partials/academic_year_list.html', {'years': years})
-                response['HX-Trigger'] = 'closeModal'
-                return response
+                years = _annotated_academic_years()
+                return _render_and_close_modal(request, 'academics/partials/academic_year_list.html', {'years': years})
             return redirect('academics:academic_years')
     else:
         form = AcademicYearForm(instance=year)
@@ -107,13 +121,8 @@ def academic_year_delete_view(request, pk):
         year.delete()
         messages.success(request, 'Academic year deleted successfully.')
         if request.htmx:
-            years = AcademicYear.objects.annotate(
-                term_count=Count('terms'),
-                class_count=Count('classes')
-            )
-            response = render(request, 'academics/partials/academic_year_list.html', {'years': years})
-            response['HX-Trigger'] = 'closeModal'
-            return response
+            years = _annotated_academic_years()
+            return _render_and_close_modal(request, 'academics/partials/academic_year_list.html', {'years': years})
         return redirect('academics:academic_years')
 
     if request.htmx:
@@ -132,10 +141,8 @@ def term_add_view(request):
             form.save()
             messages.success(request, 'Term created successfully.')
             if request.htmx:
-                terms = Term.objects.select_related('academic_year').order_by('-academic_year__start_date', 'term_number')
-                response = render(request, 'dashboard/partials/settings_terms.html', {'terms': terms})
-                response['HX-Trigger'] = 'closeModal'
-                return response
+                terms = Term.objects.cached_list()
+                return _render_and_close_modal(request, 'dashboard/partials/settings_terms.html', {'terms': terms})
             return redirect('dashboard:settings')
     else:
         form = TermForm()
@@ -157,10 +164,8 @@ def term_edit_view(request, pk):
             form.save()
             messages.success(request, 'Term updated successfully.')
             if request.htmx:
-                terms = Term.objects.select_related('academic_year').order_by('-academic_year__start_date', 'term_number')
-                response = render(request, 'dashboard/partials/settings_terms.html', {'terms': terms})
-                response['HX-Trigger'] = 'closeModal'
-                return response
+                terms = Term.objects.cached_list()
+                return _render_and_close_modal(request, 'dashboard/partials/settings_terms.html', {'terms': terms})
             return redirect('dashboard:settings')
     else:
         form = TermForm(instance=term)
@@ -174,16 +179,15 @@ def term_edit_view(request, pk):
 @login_required
 def term_delete_view(request, pk):
     """Delete a term"""
-    term = get_object_or_404(Term, pk=pk)
+    # The confirmation modal names the term's academic year
+    term = get_object_or_404(Term.objects.select_related('academic_year'), pk=pk)
 
     if request.method == 'POST':
         term.delete()
         messages.success(request, 'Term deleted successfully.')
         if request.htmx:
-            terms = Term.objects.select_related('academic_year').order_by('-academic_year__start_date', 'term_number')
-            response = render(request, 'dashboard/partials/settings_terms.html', {'terms': terms})
-            response['HX-Trigger'] = 'closeModal'
-            return response
+            terms = Term.objects.cached_list()
+            return _render_and_close_modal(request, 'dashboard/partials/settings_terms.html', {'terms': terms})
         return redirect('dashboard:settings')
 
     if request.htmx:
@@ -193,10 +197,18 @@ def term_delete_view(request, pk):
 
 # ==================== Grade Level Views ====================
 
+def _annotated_grade_levels():
+    """Grade level rows with the class count the list shows"""
+    # The list only reads plain columns, so plain dicts are enough
+    return GradeLevel.objects.with_class_count().values(
+        'pk', 'name', 'code', 'level_type', 'numeric_level', 'order', 'is_active', 'class_count'
+    )
+
+
 @login_required
 def grade_level_list_view(request):
     """List all grade levels"""
-    levels = GradeLevel.objects.annotate(class_count=Count('classes'))
+    levels = _annotated_grade_levels()
 
     breadcrumbs = [
         {'name': 'Dashboard', 'url': reverse('dashboard:main_partial')},
@@ -224,10 +236,8 @@ def grade_level_add_view(request):
             form.save()
             messages.success(request, 'Grade level created successfully.')
             if request.htmx:
-                levels = GradeLevel.objects.annotate(class_count=Count('classes'))
-                response = render(request, 'academics/partials/grade_level_list.html', {'levels': levels})
-                response['HX-Trigger'] = 'closeModal'
-                return response
+                levels = _annotated_grade_levels()
+                return _render_and_close_modal(request, 'academics/partials/grade_level_list.html', {'levels': levels})
             return redirect('academics:grade_levels')
     else:
         form = GradeLevelForm()
@@ -249,10 +259,8 @@ def grade_level_edit_view(request, pk):
             form.save()
             messages.success(request, 'Grade level updated successfully.')
             if request.htmx:
-                levels = GradeLevel.objects.annotate(class_count=Count('classes'))
-                response = render(request, 'academics/partials/grade_level_list.html', {'levels': levels})
-                response['HX-Trigger'] = 'closeModal'
-                return response
+                levels = _annotated_grade_levels()
+                return _render_and_close_modal(request, 'academics/partials/grade_level_list.html', {'levels': levels})
             return redirect('academics:grade_levels')
     else:
         form = GradeLevelForm(instance=level)
@@ -272,10 +280,8 @@ def grade_level_delete_view(request, pk):
         level.delete()
         messages.success(request, 'Grade level deleted successfully.')
         if request.htmx:
-            levels = GradeLevel.objects.annotate(class_count=Count('classes'))
-            response = render(request, 'academics/partials/grade_level_list.html', {'levels': levels})
-            response['HX-Trigger'] = 'closeModal'
-            return response
+            levels = _annotated_grade_levels()
+            return _render_and_close_modal(request, 'academics/partials/grade_level_list.html', {'levels': levels})
         return redirect('academics:grade_levels')
 
     if request.htmx:
@@ -292,22 +298,18 @@ def _get_filtered_classes(request):
     if academic_year_id:
         selected_year = AcademicYear.objects.filter(pk=academic_year_id).first()
     else:
-        selected_year = AcademicYear.objects.filter(is_current=True).first()
-
-    # Annotate with enrollment count for the selected/current year
-    classes = Class.objects.select_related(
-        'grade_level', 'programme', 'class_teacher'
+        selected_year = AcademicYear.objects.current()
+
+    # The stored count covers the current year; other years are counted here.
+    # Load only the columns the list renders, notably not the whole teacher row
+    classes = Class.objects.with_display_fields().only(
+        'id', 'section', 'capacity', 'enrollment_count', 'is_active',
+        'grade_level__name', 'grade_level__numeric_level',
+        'programme__code',
+        'class_teacher__first_name', 'class_teacher__middle_name', 'class_teacher__last_name'
     )
-
-    if selected_year:
-        classes = classes.annotate(
-            student_count=Count(
-                'enrollments',
-                filter=Q(enrollments__academic_year=selected_year, enrollments__is_active=True)
-            )
-        )
-    else:
-        classes = classes.annotate(student_count=Count('enrollments'))
+    if selected_year and selected_year.pk != AcademicYear.objects.current_pk():
+        classes = classes.with_enrollment(selected_year)
 
     # Filtering
     grade_level = request.GET.get('grade_level')
@@ -327,14 +329,19 @@ def _get_filtered_classes(request):
 
     return {
         'classes': classes,
-        'academic_years': AcademicYear.objects.all(),
-        'grade_levels': GradeLevel.objects.all(),
+        'academic_years': _cached_academic_years(),
+        'grade_levels': _cached_grade_levels(),
         'selected_year': selected_year,
         'selected_grade_level': grade_level or '',
         'selected_status': status or '',
     }
 
 
+def _render_class_list_partial(request):
+    """Render the filtered, paginated class list partial and close the modal"""
+    return _render_and_close_modal(request, 'academics/partials/class_list.html', _get_filtered_classes(request))
+
+
 @login_required
 def class_list_view(request):
     """List all classes with filtering"""
@@ -372,26 +379,7 @@ def class_add_view(request):
             form.save()
             messages.success(request, 'Class created successfully.')
             if request.htmx:
-                current_year = AcademicYear.objects.filter(is_current=True).first()
-                classes = Class.objects.select_related(
-                    'grade_level', 'programme', 'class_teacher'
-                )
-                if current_year:
-                    classes = classes.annotate(
-                        student_count=Count(
-                            'enrollments',
-                            filter=Q(enrollments__academic_year=current_year, enrollments__is_active=True)
-                        )
-                    )
-                else:
-                    classes = classes.annotate(student_count=Count('enrollments'))
-                response = render(request, 'academics/partials/class_list.html', {
-                    'classes': classes,
-                    'academic_years': AcademicYear.objects.all(),
-                    'grade_levels': GradeLevel.objects.all(),
-                })
-                response['HX-Trigger'] = 'closeModal'
-                return response
+                return _render_class_list_partial(request)
             return redirect('academics:classes')
     else:
         form = ClassForm()
@@ -405,28 +393,23 @@ def class_add_view(request):
 @login_required
 def class_detail_view(request, pk):
     """View class details"""
-    class_obj = get_object_or_404(
-        Class.objects.select_related(
-            'grade_level', 'programme', 'class_teacher'
-        ).prefetch_related('class_subjects__subject', 'class_subjects__teacher'),
-        pk=pk
-    )
-
     # Get selected or current academic year
     academic_year_id = request.GET.get('academic_year')
     if academic_year_id:
         selected_year = AcademicYear.objects.filter(pk=academic_year_id).first()
     else:
-        selected_year = AcademicYear.objects.filter(is_current=True).first()
+        selected_year = AcademicYear.objects.current()
 
-    # Get enrolled students for the selected year
-    enrollments = []
+    # Load the class together with its enrolled students for the selected year
+    classes = Class.objects.with_display_fields()
     if selected_year:
-        enrollments = ClassEnrollment.objects.filter(
-            class_instance=class_obj,
-            academic_year=selected_year,
-            is_active=True
-        ).select_related('student')
+        classes = classes.prefetch_related(Prefetch(
+            'enrollments',
+            queryset=ClassEnrollment.objects.roster(selected_year),
+            to_attr='year_enrollments'
+        ))
+    class_obj = get_object_or_404(classes, pk=pk)
+    enrollments = getattr(class_obj, 'year_enrollments', [])
 
     breadcrumbs = [
         {'name': 'Dashboard', 'url': reverse('dashboard:main_partial')},
@@ -438,8 +421,8 @@ def class_detail_view(request, pk):
         'class': class_obj,
         'enrollments': enrollments,
         'selected_year': selected_year,
-        'academic_years': AcademicYear.objects.all(),
-        'subjects': class_obj.class_subjects.filter(is_active=True),
+        'academic_years': _cached_academic_years(),
+        'subjects': ClassSubject.objects.for_class(class_obj.pk),
         'breadcrumbs': breadcrumbs,
     }
 
@@ -464,26 +447,7 @@ def class_edit_view(request, pk):
             form.save()
             messages.success(request, 'Class updated successfully.')
             if request.htmx:
-                current_year = AcademicYear.objects.filter(is_current=True).first()
-                classes = Class.objects.select_related(
-                    'grade_level', 'programme', 'class_teacher'
-                )
-                if current_year:
-                    classes = classes.annotate(
-                        student_count=Count(
-                            'enrollments',
-                            filter=Q(enrollments__academic_year=current_year, enrollments__is_active=True)
-                        )
-                    )
-                else:
-                    classes = classes.annotate(student_count=Count('enrollments'))
-                response = render(request, 'academics/partials/class_list.html', {
-                    'classes': classes,
-                    'academic_years': AcademicYear.objects.all(),
-                    'grade_levels': GradeLevel.objects.all(),
-                })
-                response['HX-Trigger'] = 'closeModal'
-                return response
+                return _render_class_list_partial(request)
             return redirect('academics:classes')
     else:
         form = ClassForm(instance=class_obj)
@@ -503,26 +467,7 @@ def class_delete_view(request, pk):
         class_obj.delete()
         messages.success(request, 'Class deleted successfully.')
         if request.htmx:
-            current_year = AcademicYear.objects.filter(is_current=True).first()
-            classes = Class.objects.select_related(
-                'grade_level', 'programme', 'class_teacher'
-            )
-            if current_year:
-                classes = classes.annotate(
-                    student_count=Count(
-                        'enrollments',
-                        filter=Q(enrollments__academic_year=current_year, enrollments__is_active=True)
-                    )
-                )
-            else:
-                classes = classes.annotate(student_count=Count('enrollments'))
-            response = render(request, 'academics/partials/class_list.html', {
-                'classes': classes,
-                'academic_years': AcademicYear.objects.all(),
-                'grade_levels': GradeLevel.objects.all(),
-            })
-            response['HX-Trigger'] = 'closeModal'
-            return response
+            return _render_class_list_partial(request)
         return redirect('academics:classes')
 
     if request.htmx:
@@ -532,11 +477,17 @@ def class_delete_view(request, pk):
 
 # ==================== Subject Views ====================
 
+def _annotated_subjects():
+    """Subject rows with the columns and class count the list shows"""
+    # Plain dicts of the listed columns; no description text, timestamps or models
+    return Subject.objects.with_class_count().values(
+        'pk', 'name', 'code', 'subject_type', 'credit_hours', 'is_active', 'class_count'
+    )
+
+
 def _get_filtered_subjects(request):
     """Helper to get filtered subjects queryset and context"""
-    subjects = Subject.objects.annotate(
-        class_count=Count('class_assignments')
-    )
+    subjects = _annotated_subjects()
 
     # Filtering
     subject_type = request.GET.get('type')
@@ -593,10 +544,8 @@ def subject_add_view(request):
             form.save()
             messages.success(request, 'Subject created successfully.')
             if request.htmx:
-                subjects = Subject.objects.annotate(class_count=Count('class_assignments'))
-                response = render(request, 'academics/partials/subject_list.html', {'subjects': subjects})
-                response['HX-Trigger'] = 'closeModal'
-                return response
+                subjects = _annotated_subjects()
+                return _render_and_close_modal(request, 'academics/partials/subject_list.html', {'subjects': subjects})
             return redirect('academics:subjects')
     else:
         form = SubjectForm()
@@ -611,11 +560,9 @@ def subject_add_view(request):
 def subject_detail_view(request, pk):
     """View subject details"""
     subject = get_object_or_404(
-        Subject.objects.prefetch_related(
+        Subject.objects.with_relations().prefetch_related(
             'class_assignments__class_instance',
-            'class_assignments__teacher',
-            'applicable_levels',
-            'programmes'
+            'class_assignments__teacher'
         ),
         pk=pk
     )
@@ -653,10 +600,8 @@ def subject_edit_view(request, pk):
             form.save()
             messages.success(request, 'Subject updated successfully.')
             if request.htmx:
-                subjects = Subject.objects.annotate(class_count=Count('class_assignments'))
-                response = render(request, 'academics/partials/subject_list.html', {'subjects': subjects})
-                response['HX-Trigger'] = 'closeModal'
-                return response
+                subjects = _annotated_subjects()
+                return _render_and_close_modal(request, 'academics/partials/subject_list.html', {'subjects': subjects})
             return redirect('academics:subjects')
     else:
         form = SubjectForm(instance=subject)
@@ -676,10 +621,8 @@ def subject_delete_view(request, pk):
         subject.delete()
         messages.success(request, 'Subject deleted successfully.')
         if request.htmx:
-            subjects = Subject.objects.annotate(class_count=Count('class_assignments'))
-            response = render(request, 'academics/partials/subject_list.html', {'subjects': subjects})
-            response['HX-Trigger'] = 'closeModal'
-            return response
+            subjects = _annotated_subjects()
+            return _render_and_close_modal(request, 'academics/partials/subject_list.html', {'subjects': subjects})
         return redirect('academics:subjects')
 
     if request.htmx:
@@ -704,19 +647,17 @@ def class_subject_add_view(request, class_pk):
             if request.htmx:
                 context = {
                     'class': class_obj,
-                    'subjects': class_obj.class_subjects.filter(is_active=True),
+                    'subjects': ClassSubject.objects.for_class(class_obj.pk),
                 }
-                response = render(request, 'academics/partials/class_subjects_section.html', context)
-                response['HX-Trigger'] = 'closeModal'
-                return response
+                return _render_and_close_modal(request, 'academics/partials/class_subjects_section.html', context)
             return redirect('academics:class_detail', pk=class_pk)
     else:
         form = ClassSubjectForm(initial={'class_instance': class_obj})
-        # Exclude already assigned subjects
-        assigned_subjects = class_obj.class_subjects.values_list('subject_id', flat=True)
+        # Exclude already assigned subjects (NOT EXISTS, planned as an anti-join)
+        assigned = ClassSubject.objects.filter(class_instance=class_obj, subject=OuterRef('pk'))
         form.fields['subject'].queryset = Subject.objects.filter(
-            is_active=True
-        ).exclude(pk__in=assigned_subjects)
+            ~Exists(assigned), is_active=True
+        ).only('id', 'name', 'code')
         form.fields['class_instance'].widget = form.fields['class_instance'].hidden_widget()
 
     context = {
@@ -744,11 +685,9 @@ def class_subject_edit_view(request, class_pk, pk):
             if request.htmx:
                 context = {
                     'class': class_obj,
-                    'subjects': class_obj.class_subjects.filter(is_active=True),
+                    'subjects': ClassSubject.objects.for_class(class_obj.pk),
                 }
-                response = render(request, 'academics/partials/class_subjects_section.html', context)
-                response['HX-Trigger'] = 'closeModal'
-                return response
+                return _render_and_close_modal(request, 'academics/partials/class_subjects_section.html', context)
             return redirect('academics:class_detail', pk=class_pk)
     else:
         form = ClassSubjectForm(instance=class_subject)
@@ -770,7 +709,10 @@ def class_subject_edit_view(request, class_pk, pk):
 def class_subject_remove_view(request, class_pk, pk):
     """Remove a subject from a class"""
     class_obj = get_object_or_404(Class, pk=class_pk)
-    class_subject = get_object_or_404(ClassSubject, pk=pk, class_instance=class_obj)
+    # The confirmation modal names the subject and teacher
+    class_subject = get_object_or_404(
+        ClassSubject.objects.select_related('subject', 'teacher'), pk=pk, class_instance=class_obj
+    )
 
     if request.method == 'POST':
         class_subject.delete()
@@ -778,11 +720,9 @@ def class_subject_remove_view(request, class_pk, pk):
         if request.htmx:
             context = {
                 'class': class_obj,
-                'subjects': class_obj.class_subjects.filter(is_active=True),
+                'subjects': ClassSubject.objects.for_class(class_obj.pk),
             }
-            response = render(request, 'academics/partials/class_subjects_section.html', context)
-            response['HX-Trigger'] = 'closeModal'
-            return response
+            return _render_and_close_modal(request, 'academics/partials/class_subjects_section.html', context)
         return redirect('academics:class_detail', pk=class_pk)
 
     if request.htmx:
@@ -798,13 +738,15 @@ def class_subject_remove_view(request, class_pk, pk):
 
 # ==================== Programme Views ====================
 
+def _annotated_programmes():
+    """Programmes with the class and subject counts the list shows"""
+    return Programme.objects.with_counts()
+
+
 @login_required
 def programme_list_view(request):
     """List all programmes"""
-    programmes = Programme.objects.annotate(
-        class_count=Count('classes'),
-        subject_count=Count('subjects')
-    )
+    programmes = _annotated_programmes()
 
     breadcrumbs = [
         {'name': 'Dashboard', 'url': reverse('dashboard:main_partial')},
@@ -832,13 +774,8 @@ def programme_add_view(request):
             form.save()
             messages.success(request, 'Programme created successfully.')
             if request.htmx:
-                programmes = Programme.objects.annotate(
-                    class_count=Count('classes'),
-                    subject_count=Count('subjects')
-                )
-                response = render(request, 'academics/partials/programme_list.html', {'programmes': programmes})
-                response['HX-Trigger'] = 'closeModal'
-                return response
+                programmes = _annotated_programmes()
+                return _render_and_close_modal(request, 'academics/partials/programme_list.html', {'programmes': programmes})
             return redirect('academics:programmes')
     else:
         form = ProgrammeForm()
@@ -860,13 +797,8 @@ def programme_edit_view(request, pk):
             form.save()
             messages.success(request, 'Programme updated successfully.')
             if request.htmx:
-                programmes = Programme.objects.annotate(
-                    class_count=Count('classes'),
-                    subject_count=Count('subjects')
-                )
-                response = render(request, 'academics/partials/programme_list.html', {'programmes': programmes})
-                response['HX-Trigger'] = 'closeModal'
-                return response
+                programmes = _annotated_programmes()
+                return _render_and_close_modal(request, 'academics/partials/programme_list.html', {'programmes': programmes})
             return redirect('academics:programmes')
     else:
         form = ProgrammeForm(instance=programme)
@@ -886,13 +818,8 @@ def programme_delete_view(request, pk):
         programme.delete()
         messages.success(request, 'Programme deleted successfully.')
         if request.htmx:
-            programmes = Programme.objects.annotate(
-                class_count=Count('classes'),
-                subject_count=Count('subjects')
-            )
-            response = render(request, 'academics/partials/programme_list.html', {'programmes': programmes})
-            response['HX-Trigger'] = 'closeModal'
-            return response
+            programmes = _annotated_programmes()
+            return _render_and_close_modal(request, 'academics/partials/programme_list.html', {'programmes': programmes})
         return redirect('academics:programmes')
 
     if request.htmx:
@@ -902,11 +829,42 @@ def programme_delete_view(request, pk):
 
 # ==================== Class Enrollment Views ====================
 
+def _render_class_students_refresh(request, class_obj, academic_year):
+    """Re-render a class's students section plus an out-of-band stats swap"""
+    context = {
+        'class': class_obj,
+        'enrollments': ClassEnrollment.objects.roster(academic_year).filter(class_instance=class_obj),
+        'selected_year': academic_year,
+        'academic_years': _cached_academic_years(),
+        'subjects': ClassSubject.objects.for_class(class_obj.pk),
+    }
+    students_html = render_to_string('academics/partials/class_students_section.html', context, request)
+    stats_html = render_to_string('academics/partials/class_stats_section.html', {**context, 'stats_oob': True}, request)
+    response = HttpResponse(students_html + stats_html)
+    response['HX-Trigger'] = 'closeModal'
+    return response
+
+
+def _students_available_for(academic_year):
+    """Active students without an active enrollment in academic_year"""
+    from students.models import Student
+
+    students = Student.objects.filter(is_active=True).only(
+        'student_id', 'first_name', 'middle_name', 'last_name', 'residential_status'
+    )
+    if academic_year is None:
+        return students
+    # NOT EXISTS lets the database anti-join; NOT IN over a subquery cannot
+    return students.filter(~Exists(ClassEnrollment.objects.filter(
+        student=OuterRef('pk'),
+        academic_year=academic_year,
+        is_active=True
+    )))
+
+
 @login_required
 def class_enrollment_add_view(request, class_pk):
     """Enroll a student in a class"""
-    from students.models import Student
-
     class_obj = get_object_or_404(Class, pk=class_pk)
 
     # Get current or selected academic year
@@ -914,7 +872,7 @@ def class_enrollment_add_view(request, class_pk):
     if academic_year_id:
         selected_year = AcademicYear.objects.filter(pk=academic_year_id).first()
     else:
-        selected_year = AcademicYear.objects.filter(is_current=True).first()
+        selected_year = AcademicYear.objects.current()
 
     if request.method == 'POST':
         form = ClassEnrollmentForm(request.POST)
@@ -924,43 +882,13 @@ def class_enrollment_add_view(request, class_pk):
             enrollment.save()
             messages.success(request, f'{enrollment.student} enrolled successfully.')
             if request.htmx:
-                enrollments = ClassEnrollment.objects.filter(
-                    class_instance=class_obj,
-                    academic_year=enrollment.academic_year,
-                    is_active=True
-                ).select_related('student')
-                subjects = class_obj.class_subjects.filter(is_active=True)
-                context = {
-                    'class': class_obj,
-                    'enrollments': enrollments,
-                    'selected_year': enrollment.academic_year,
-                    'academic_years': AcademicYear.objects.all(),
-                    'subjects': subjects,
-                }
-                # Render both sections - students and stats (OOB swap)
-                students_html = render(request, 'academics/partials/class_students_section.html', context).content.decode()
-                stats_html = render(request, 'academics/partials/class_stats_section.html', context).content.decode()
-                # Add hx-swap-oob to stats section
-                stats_html = stats_html.replace('id="class-stats-section"', 'id="class-stats-section" hx-swap-oob="true"')
-                combined_html = students_html + stats_html
-                response = HttpResponse(combined_html)
-                response['HX-Trigger'] = 'closeModal'
-                return response
+                return _render_class_students_refresh(request, class_obj, enrollment.academic_year)
             return redirect('academics:class_detail', pk=class_pk)
     else:
         initial = {'academic_year': selected_year, 'class_instance': class_obj}
         form = ClassEnrollmentForm(initial=initial)
         # Exclude already enrolled students for this year
-        if selected_year:
-            enrolled_students = ClassEnrollment.objects.filter(
-                academic_year=selected_year,
-                is_active=True
-            ).values_list('student_id', flat=True)
-            form.fields['student'].queryset = Student.objects.filter(
-                is_active=True
-            ).exclude(pk__in=enrolled_students)
-        else:
-            form.fields['student'].queryset = Student.objects.filter(is_active=True)
+        form.fields['student'].queryset = _students_available_for(selected_year)
         form.fields['class_instance'].widget = form.fields['class_instance'].hidden_widget()
 
     context = {
@@ -979,7 +907,10 @@ def class_enrollment_add_view(request, class_pk):
 def class_enrollment_remove_view(request, class_pk, pk):
     """Remove a student enrollment from a class"""
     class_obj = get_object_or_404(Class, pk=class_pk)
-    enrollment = get_object_or_404(ClassEnrollment, pk=pk, class_instance=class_obj)
+    # Both the modal and the removal message read the student and year
+    enrollment = get_object_or_404(
+        ClassEnrollment.objects.select_related('student', 'academic_year'), pk=pk, class_instance=class_obj
+    )
 
     if request.method == 'POST':
         student_name = str(enrollment.student)
@@ -987,28 +918,7 @@ def class_enrollment_remove_view(request, class_pk, pk):
         enrollment.delete()
         messages.success(request, f'{student_name} removed from class.')
         if request.htmx:
-            enrollments = ClassEnrollment.objects.filter(
-                class_instance=class_obj,
-                academic_year=academic_year,
-                is_active=True
-            ).select_related('student')
-            subjects = class_obj.class_subjects.filter(is_active=True)
-            context = {
-                'class': class_obj,
-                'enrollments': enrollments,
-                'selected_year': academic_year,
-                'academic_years': AcademicYear.objects.all(),
-                'subjects': subjects,
-            }
-            # Render both sections - students and stats (OOB swap)
-            students_html = render(request, 'academics/partials/class_students_section.html', context).content.decode()
-            stats_html = render(request, 'academics/partials/class_stats_section.html', context).content.decode()
-            # Add hx-swap-oob to stats section
-            stats_html = stats_html.replace('id="class-stats-section"', 'id="class-stats-section" hx-swap-oob="true"')
-            combined_html = students_html + stats_html
-            response = HttpResponse(combined_html)
-            response['HX-Trigger'] = 'closeModal'
-            return response
+            return _render_class_students_refresh(request, class_obj, academic_year)
         return redirect('academics:class_detail', pk=class_pk)
 
     if request.htmx:
@@ -1034,70 +944,70 @@ def bulk_enrollment_view(request, class_pk):
     if academic_year_id:
         selected_year = AcademicYear.objects.filter(pk=academic_year_id).first()
     else:
-        selected_year = AcademicYear.objects.filter(is_current=True).first()
+        selected_year = AcademicYear.objects.current()
 
     if request.method == 'POST':
         academic_year = get_object_or_404(AcademicYear, pk=request.POST.get('academic_year'))
         student_ids = request.POST.getlist('students')
 
-        created_count = 0
-        for student_id in student_ids:
-            student = Student.objects.filter(pk=student_id, is_active=True).first()
-            if student:
-                enrollment, created = ClassEnrollment.objects.get_or_create(
-                    student=student,
-                    academic_year=academic_year,
-                    defaults={
-                        'class_instance': class_obj,
-                        'is_active': True
-                    }
-                )
-                if created:
-                    created_count += 1
+        # Skip inactive students and students already enrolled for the year
+        already_enrolled = ClassEnrollment.objects.filter(
+            academic_year=academic_year
+        ).values_list('student_id', flat=True)
+        new_student_ids = list(Student.objects.filter(
+            pk__in=student_ids, is_active=True
+        ).exclude(pk__in=already_enrolled).values_list('pk', flat=True))
+
+        with transaction.atomic():
+            ClassEnrollment.objects.bulk_create(
+                [
+                    ClassEnrollment(
+                        student_id=student_id,
+                        class_instance=class_obj,
+                        academic_year=academic_year,
+                        is_active=True
+                    )
+                    for student_id in new_student_ids
+                ],
+                batch_size=500,
+                ignore_conflicts=True
+            )
+            # ignore_conflicts drops rows for students a concurrent request
+            # enrolled in the meantime, so re-read who is now in this class
+            enrolled_ids = list(ClassEnrollment.objects.filter(
+                class_instance=class_obj,
+                academic_year=academic_year,
+                student_id__in=new_student_ids
+            ).values_list('student_id', flat=True))
+            # bulk_create skips ClassEnrollment.save(), so update current_class
+            # and the stored enrollment count here
+            if enrolled_ids and academic_year.pk == AcademicYear.objects.current_pk():
+                Student.objects.filter(pk__in=enrolled_ids).update(current_class=class_obj)
+                Class.objects.filter(pk=class_obj.pk).refresh_enrollment_counts()
+        created_count = len(enrolled_ids)
 
         messages.success(request, f'{created_count} student(s) enrolled successfully.')
         if request.htmx:
-            enrollments = ClassEnrollment.objects.filter(
-                class_instance=class_obj,
-                academic_year=academic_year,
-                is_active=True
-            ).select_related('student')
-            subjects = class_obj.class_subjects.filter(is_active=True)
-            context = {
-                'class': class_obj,
-                'enrollments': enrollments,
-                'selected_year': academic_year,
-                'academic_years': AcademicYear.objects.all(),
-                'subjects': subjects,
-            }
-            # Render both sections - students and stats (OOB swap)
-            students_html = render(request, 'academics/partials/class_students_section.html', context).content.decode()
-            stats_html = render(request, 'academics/partials/class_stats_section.html', context).content.decode()
-            # Add hx-swap-oob to stats section
-            stats_html = stats_html.replace('id="class-stats-section"', 'id="class-stats-section" hx-swap-oob="true"')
-            combined_html = students_html + stats_html
-            response = HttpResponse(combined_html)
-            response['HX-Trigger'] = 'closeModal'
-            return response
+            return _render_class_students_refresh(request, class_obj, academic_year)
         return redirect('academics:class_detail', pk=class_pk)
 
-    # Get students not enrolled in this academic year
-    enrolled_students = []
-    if selected_year:
-        enrolled_students = ClassEnrollment.objects.filter(
-            academic_year=selected_year,
-            is_active=True
-        ).values_list('student_id', flat=True)
+    # Get students not enrolled in this academic year, a page at a time;
+    # the modal loads further pages as the list is scrolled
+    available_students = _students_available_for(selected_year).order_by('last_name', 'first_name')
+    students = Paginator(available_students, 50).get_page(request.GET.get('page'))
 
-    available_students = Student.objects.filter(
-        is_active=True
-    ).exclude(pk__in=enrolled_students).order_by('last_name', 'first_name')
+    if request.htmx and 'page' in request.GET:
+        return render(request, 'academics/partials/bulk_enrollment_students.html', {
+            'class': class_obj,
+            'selected_year': selected_year,
+            'students': students,
+        })
 
     context = {
         'class': class_obj,
         'selected_year': selected_year,
         'academic_years': AcademicYear.objects.filter(is_active=True),
-        'students': available_students,
+        'students': students,
         'modal_title': f'Bulk Enroll Students in {class_obj}'
     }
 
@@ -1157,7 +1067,6 @@ def promotion_preview_view(request):
     Preview students to be promoted - shows list with checkboxes.
     """
     from .forms import PromotionForm
-    from students.models import Student
 
     if request.method != 'POST':
         return redirect('academics:promotion')
@@ -1177,35 +1086,42 @@ def promotion_preview_view(request):
     target_class = form.cleaned_data.get('target_class')
     promotion_type = form.cleaned_data['promotion_type']
 
-    # Get students enrolled in source class for source year
-    enrollments = ClassEnrollment.objects.filter(
-        class_instance=source_class,
-        academic_year=source_year,
-        is_active=True
-    ).select_related('student__user').order_by('student__last_name', 'student__first_name')
-
     # For graduation, check if students are already graduated
     # For other actions, check if already enrolled in target year
     if promotion_type == 'graduate':
-        already_processed = set(Student.objects.filter(
-            status='graduated'
-        ).values_list('pk', flat=True))
-    else:
-        already_processed = set(ClassEnrollment.objects.filter(
+        already_processed = Q(student__status='graduated')
+    elif target_year:
+        already_processed = Exists(ClassEnrollment.objects.filter(
+            student=OuterRef('student'),
             academic_year=target_year,
             is_active=True
-        ).values_list('student_id', flat=True)) if target_year else set()
+        ))
+    else:
+        already_processed = Value(False)
+
+    # Get students enrolled in source class for source year, flagged in the same query
+    enrollments = ClassEnrollment.objects.filter(
+        class_instance=source_class,
+        academic_year=source_year,
+        is_active=True
+    ).select_related('student').defer('notes').annotate(
+        is_already_processed=ExpressionWrapper(already_processed, output_field=BooleanField()),
+        can_promote=Case(
+            When(is_already_processed=False, student__status='active', then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField()
+        )
+    ).order_by('student__last_name', 'student__first_name')
 
-    students_data = []
-    for enrollment in enrollments:
-        student = enrollment.student
-        is_already_processed = student.pk in already_processed
-        students_data.append({
+    students_data = [
+        {
             'enrollment': enrollment,
-            'student': student,
-            'is_already_enrolled': is_already_processed,
-            'can_promote': not is_already_processed and student.status == 'active',
-        })
+            'student': enrollment.student,
+            'is_already_enrolled': enrollment.is_already_processed,
+            'can_promote': enrollment.can_promote,
+        }
+        for enrollment in enrollments
+    ]
 
     promotable_count = sum(1 for s in students_data if s['can_promote'])
     already_enrolled_count = sum(1 for s in students_data if s['is_already_enrolled'])
@@ -1257,83 +1173,121 @@ def promotion_execute_view(request):
         messages.error(request, 'No students selected for promotion.')
         return redirect('academics:promotion')
 
-    # Get objects
+    # Get objects; Class.__str__ (used in notes and messages) reads the
+    # grade level and programme, so load them with the class
+    classes = Class.objects.with_display_fields()
     source_year = get_object_or_404(AcademicYear, pk=source_year_id)
-    source_class = get_object_or_404(Class, pk=source_class_id)
+    source_class = get_object_or_404(classes, pk=source_class_id)
 
     # For graduation, target class/year are optional
     target_year = None
     target_class = None
     if promotion_type != 'graduate':
-        target_year = get_object_or_404(AcademicYear, pk=target_year_id)
-        target_class = get_object_or_404(Class, pk=target_class_id)
+        if str(target_year_id) == str(source_year.pk):
+            target_year = source_year
+        else:
+            target_year = get_object_or_404(AcademicYear, pk=target_year_id)
+        target_class = get_object_or_404(classes, pk=target_class_id)
 
-    # Process promotions/graduations
+    # Process promotions/graduations in bulk: one query to load the source
+    # enrollments, then set-based writes instead of a save per student
     promoted_count = 0
     graduated_count = 0
     skipped_count = 0
     errors = []
 
-    for student_id in student_ids:
-        try:
-            # Get source enrollment
-            source_enrollment = ClassEnrollment.objects.get(
-                student_id=student_id,
-                class_instance=source_class,
-                academic_year=source_year,
-                is_active=True
+    source = ClassEnrollment.objects.filter(
+        student_id__in=[pk for pk in student_ids if pk.isdigit()],
+        class_instance=source_class,
+        academic_year=source_year,
+        is_active=True
+    )
+
+    now = timezone.now()
+    with transaction.atomic():
+        # Load and lock the source enrollments in one query so two overlapping
+        # promotions cannot process a student twice; rows another promotion
+        # holds are left for that request
+        source_enrollments = {
+            enrollment.student_id: enrollment
+            for enrollment in source.select_for_update(skip_locked=True, of=('self',)).only('pk', 'student_id')
+        }
+        # Rows the lock skipped that still match are held by another request;
+        # the rest are not (or no longer) in the source class
+        held = set()
+        if len(source_enrollments) < len(student_ids):
+            held = set(source.exclude(student_id__in=source_enrollments).values_list('student_id', flat=True))
+        locked_count = len(held)
+        for student_id in student_ids:
+            if not student_id.isdigit() or (
+                int(student_id) not in source_enrollments and int(student_id) not in held
+            ):
+                errors.append(f"Student {student_id} not found in source class")
+
+        if promotion_type == 'graduate':
+            # Skip students who have already graduated
+            to_graduate = list(
+                Student.objects.filter(pk__in=source_enrollments)
+                .exclude(status='graduated')
+                .values_list('pk', flat=True)
+            )
+            skipped_count += len(source_enrollments) - len(to_graduate)
+
+            Student.objects.filter(pk__in=to_graduate).update(
+                status='graduated',
+                is_active=False,
+                graduation_date=now.date(),
+                graduation_year=source_year,
+                current_class=None,
+                updated_at=now,
             )
 
-            if promotion_type == 'graduate':
-                # Graduate the student
-                student = Student.objects.get(pk=student_id)
-                if student.status == 'graduated':
-                    skipped_count += 1
-                    continue
-
-                student.status = 'graduated'
-                student.is_active = False
-                student.graduation_date = timezone.now().date()
-                student.graduation_year = source_year
-                student.current_class = None
-                student.save()
-
-                # Mark enrollment as inactive
-                source_enrollment.is_active = False
-                source_enrollment.notes = f"Graduated from {source_class} ({source_year.name})"
-                source_enrollment.save()
-
-                graduated_count += 1
-            else:
-                # Regular promotion/transfer/repeat
-                # Check if already enrolled in target year
-                existing = ClassEnrollment.objects.filter(
-                    student_id=student_id,
-                    academic_year=target_year
-                ).first()
+            # Mark enrollments as inactive
+            ClassEnrollment.objects.filter(
+                pk__in=[source_enrollments[pk].pk for pk in to_graduate]
+            ).update(
+                is_active=False,
+                notes=f"Graduated from {source_class} ({source_year.name})",
+                updated_at=now,
+            )
+            graduated_count = len(to_graduate)
 
-                if existing:
-                    skipped_count += 1
-                    continue
+            if to_graduate:
+                Class.objects.filter(pk=source_class.pk).refresh_enrollment_counts()
+        else:
+            # Regular promotion/transfer/repeat
+            # Skip students already enrolled in the target year
+            already_enrolled = set(
+                ClassEnrollment.objects.filter(
+                    student_id__in=source_enrollments,
+                    academic_year=target_year
+                ).values_list('student_id', flat=True)
+            )
+            skipped_count += len(already_enrolled)
 
-                # Create new enrollment
-                new_enrollment = ClassEnrollment.objects.create(
+            notes = f"{promotion_type.title()} from {source_class} ({source_year.name})"
+            new_enrollments = [
+                ClassEnrollment(
                     student_id=student_id,
                     class_instance=target_class,
                     academic_year=target_year,
                     is_active=True,
                     promoted_from=source_enrollment,
-                    notes=f"{promotion_type.title()} from {source_class} ({source_year.name})"
+                    notes=notes
                 )
-
-                promoted_count += 1
-
-        except ClassEnrollment.DoesNotExist:
-            errors.append(f"Student {student_id} not found in source class")
-        except Student.DoesNotExist:
-            errors.append(f"Student {student_id} not found")
-        except Exception as e:
-            errors.append(f"Error processing student {student_id}: {str(e)}")
+                for student_id, source_enrollment in source_enrollments.items()
+                if student_id not in already_enrolled
+            ]
+            ClassEnrollment.objects.bulk_create(new_enrollments, batch_size=500)
+            promoted_count = len(new_enrollments)
+
+            # bulk_create skips ClassEnrollment.save(), so apply its
+            # current-year side effects once for the whole batch
+            if new_enrollments and target_year.pk == AcademicYear.objects.current_pk():
+                Student.objects.filter(
+                    pk__in=[e.student_id for e in new_enrollments]
+                ).update(current_class=target_class, updated_at=now)
+                Class.objects.filter(pk=target_class.pk).refresh_enrollment_counts()
 
     # Build result message
     promotion_type_display = dict(PromotionForm.PROMOTION_TYPE_CHOICES).get(promotion_type, promotion_type)
@@ -1358,6 +1312,13 @@ def promotion_execute_view(request):
         else:
             messages.warning(request, f'{skipped_count} student(s) skipped (already enrolled in {target_year.name}).')
 
+    if locked_count > 0:
+        messages.warning(
+            request,
+            f'{locked_count} student(s) are being processed by another request and were not changed; '
+            f'run the promotion again to retry them.'
+        )
+
     if errors:
         messages.error(request, f'{len(errors)} error(s) occurred during processing.')
 
@@ -1365,6 +1326,7 @@ def promotion_execute_view(request):
         'promoted_count': promoted_count,
         'graduated_count': graduated_count,
         'skipped_count': skipped_count,
+        'locked_count': locked_count,
         'errors': errors,
         'source_class': source_class,
         'source_year': source_year,
@@ -1395,20 +1357,28 @@ def get_class_students_json(request, class_pk):
 
     class_obj = get_object_or_404(Class, pk=class_pk)
 
-    enrollments = ClassEnrollment.objects.filter(
+    # Read only the student columns the response needs, without building models
+    rows = ClassEnrollment.objects.filter(
         class_instance=class_obj,
         academic_year_id=academic_year_id,
         is_active=True
-    ).select_related('student').order_by('student__last_name', 'student__first_name')
+    ).order_by('student__last_name', 'student__first_name').values_list(
+        'student_id', 'student__first_name', 'student__middle_name',
+        'student__last_name', 'student__student_id', 'student__gender'
+    )
 
     students = [
         {
-            'id': e.student.pk,
-            'name': e.student.get_full_name(),
-            'student_id': e.student.student_id,
-            'gender': e.student.gender,
+            'id': pk,
+            # Same format as Student.get_full_name()
+            'name': (
+                f"{first_name} {middle_name} {last_name}" if middle_name
+                else f"{first_name} {last_name}"
+            ),
+            'student_id': student_id,
+            'gender': gender,
         }
-        for e in enrollments
+        for pk, first_name, middle_name, last_name, student_id, gender in rows
     ]
 
     return JsonResponse({'students': students, 'count': len(students)})
@@ -1425,7 +1395,7 @@ def get_suggested_target_class(request):
     if not source_class_id:
         return JsonResponse({'suggested_class': None})
 
-    source_class = Class.objects.filter(pk=source_class_id).select_related('grade_level', 'programme').first()
+    source_class = Class.objects.filter(pk=source_class_id).with_display_fields().first()
     if not source_class:
         return JsonResponse({'suggested_class': None})
 
@@ -1439,28 +1409,19 @@ def get_suggested_target_class(request):
     if not next_grade_level:
         return JsonResponse({'suggested_class': None, 'message': 'No next grade level found'})
 
-    # Find class with same section/programme in next grade level
+    # Prefer a class with the same section and programme, then the same
+    # programme, then any class in the next grade level; rank in one query
     suggested_class = Class.objects.filter(
         grade_level=next_grade_level,
-        section=source_class.section,
-        programme=source_class.programme,
         is_active=True
-    ).first()
-
-    # If no exact match, try without section
-    if not suggested_class:
-        suggested_class = Class.objects.filter(
-            grade_level=next_grade_level,
-            programme=source_class.programme,
-            is_active=True
-        ).first()
-
-    # If still no match, just get any class in next grade level
-    if not suggested_class:
-        suggested_class = Class.objects.filter(
-            grade_level=next_grade_level,
-            is_active=True
-        ).first()
+    ).with_display_fields().annotate(
+        match=Case(
+            When(section=source_class.section, programme_id=source_class.programme_id, then=Value(2)),
+            When(programme_id=source_class.programme_id, then=Value(1)),
+            default=Value(0),
+            output_field=IntegerField()
+        )
+    ).order_by('-match', 'section').first()
 
     if suggested_class:
         return JsonResponse({
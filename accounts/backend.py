@@ -1,7 +1,8 @@
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.db import connection
-from accounts.models import User as SchoolUser
+from accounts.models import User as SchoolUser, user_cache_key
 
 
 class MultiTenantAuthBackend(ModelBackend):
@@ -12,39 +13,38 @@ class MultiTenantAuthBackend(ModelBackend):
     """
     
     def authenticate(self, request, username=None, password=None, **kwargs):
-        # Get the current schema from the connection
-        schema_name = connection.schema_name
-        
-        if schema_name == 'public':
-            # Public schema: authenticate SystemUser
-            UserModel = get_user_model()  # SystemUser
-            try:
-                user = UserModel.objects.get(email=username)
-                if user.check_password(password) and self.user_can_authenticate(user):
-                    return user
-            except UserModel.DoesNotExist:
-                return None
-        else:
-            # Tenant schema: authenticate User
-            try:
-                user = SchoolUser.objects.get(email=username)
-                if user.check_password(password) and self.user_can_authenticate(user):
-                    return user
-            except SchoolUser.DoesNotExist:
-                return None
-        
+        # Public schema authenticates SystemUser, tenant schemas their User
+        UserModel = self._user_model()
+        try:
+            user = UserModel.objects.get(email=username)
+        except UserModel.DoesNotExist:
+            # Run the hasher anyway so an unknown email takes as long as a
+            # wrong password and does not reveal which accounts exist
+            UserModel().set_password(password)
+            return None
+
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
         return None
     
     def get_user(self, user_id):
-        """Retrieve user from appropriate schema"""
-        schema_name = connection.schema_name
-        
-        if schema_name == 'public':
-            UserModel = get_user_model()
-        else:
-            UserModel = SchoolUser
-        
-        try:
-            return UserModel.objects.get(pk=user_id)
-        except UserModel.DoesNotExist:
-            return None
\ No newline at end of file
+        """Retrieve user from appropriate schema, cached between requests"""
+        UserModel = self._user_model()
+        # Saves and deletes (UserCacheMixin) and queryset update()/delete()
+        # (UserCacheQuerySet) clear this key on commit; writes that bypass
+        # the ORM, such as raw SQL, are only picked up when the entry expires
+        key = user_cache_key(UserModel, user_id)
+        user = cache.get(key)
+        if user is None:
+            try:
+                user = UserModel.objects.get(pk=user_id)
+            except UserModel.DoesNotExist:
+                return None
+            cache.set(key, user, 300)
+        return user if self.user_can_authenticate(user) else None
+
+    def _user_model(self):
+        """User model for the current schema"""
+        if connection.schema_name == 'public':
+            return get_user_model()  # SystemUser
+        return SchoolUser
@@ -1,16 +1,61 @@
 from django.contrib.auth.models import (
     AbstractBaseUser, BaseUserManager, PermissionsMixin, Group, Permission
 )
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
 
+def user_cache_key(model, pk):
+    """Cache key of a user row; the cache KEY_FUNCTION scopes it to the schema"""
+    return f'accounts:{model._meta.model_name}:{pk}'
+
+
+def clear_cached_users_on_commit(model, pks):
+    """Drop cached user rows once the current transaction commits"""
+    # Clearing earlier would let a concurrent get_user() re-cache the old row,
+    # password hash and is_active included; outside a transaction it runs at once
+    keys = [user_cache_key(model, pk) for pk in pks]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+class UserCacheMixin:
+    """Drops the row cached by the auth backend whenever the user changes"""
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        clear_cached_users_on_commit(type(self), [self.pk])
+
+    def delete(self, *args, **kwargs):
+        pk = self.pk
+        result = super().delete(*args, **kwargs)
+        clear_cached_users_on_commit(type(self), [pk])
+        return result
+
+
+class UserCacheQuerySet(models.QuerySet):
+    """Drops the cached rows of every user a bulk update or delete touches"""
+
+    def update(self, **kwargs):
+        pks = list(self.values_list('pk', flat=True))
+        rows = super().update(**kwargs)
+        clear_cached_users_on_commit(self.model, pks)
+        return rows
+
+    def delete(self):
+        pks = list(self.values_list('pk', flat=True))
+        result = super().delete()
+        clear_cached_users_on_commit(self.model, pks)
+        return result
+
+
 # ============================================================================
 # SYSTEM USER (Public Schema)
 # ============================================================================
 
-class SystemUserManager(BaseUserManager):
+class SystemUserManager(BaseUserManager.from_queryset(UserCacheQuerySet)):
     """Manager for system-wide administrators"""
     
     def create_user(self, email, password=None, **extra_fields):
@@ -38,7 +83,7 @@ class SystemUserManager(BaseUserManager):
         return self.create_user(email, password, **extra_fields)
 
 
-class SystemUser(AbstractBaseUser, PermissionsMixin):
+class SystemUser(UserCacheMixin, AbstractBaseUser, PermissionsMixin):
     """
     System-wide administrator for platform management
     Stored in public schema only
@@ -120,7 +165,7 @@ class SystemUser(AbstractBaseUser, PermissionsMixin):
 # SCHOOL USER (Tenant Schema) - Base Authentication Model
 # ============================================================================
 
-class UserManager(BaseUserManager):
+class UserManager(BaseUserManager.from_queryset(UserCacheQuerySet)):
     """Manager for tenant-specific users"""
     
     def create_user(self, email, role, password=None, **extra_fields):
@@ -154,7 +199,7 @@ class UserManager(BaseUserManager):
         return self.create_user(email, User.PARENT, password, **extra_fields)
 
 
-class User(AbstractBaseUser, PermissionsMixin):
+class User(UserCacheMixin, AbstractBaseUser, PermissionsMixin):
     """
     Base authentication model for tenant users
     Extended by Teacher, Student, and Parent models via OneToOne
@@ -172,6 +217,13 @@ class User(AbstractBaseUser, PermissionsMixin):
         (PARENT, _('Parent')),
     ]
     
+    # Reverse OneToOne accessor of each role's profile model
+    PROFILE_ATTRS = {
+        TEACHER: 'teacher_profile',
+        STUDENT: 'student_profile',
+        PARENT: 'parent_profile',
+    }
+    
     email = models.EmailField(
         _('email address'),
         unique=True,
@@ -183,8 +235,7 @@ class User(AbstractBaseUser, PermissionsMixin):
     role = models.CharField(
         _('role'),
         max_length=20,
-        choices=ROLE_CHOICES,
-        db_index=True
+        choices=ROLE_CHOICES
     )
     is_active = models.BooleanField(
         _('active'),
@@ -230,8 +281,8 @@ class User(AbstractBaseUser, PermissionsMixin):
         verbose_name_plural = _('users')
         db_table = 'users'
         ordering = ['-date_joined']
+        # email is unique and role leads role_active, so neither needs its own index
         indexes = [
-            models.Index(fields=['email', 'role'], name='user_email_role_idx'),
             models.Index(fields=['role', 'is_active'], name='user_role_active_idx'),
         ]
     
@@ -254,15 +305,15 @@ class User(AbstractBaseUser, PermissionsMixin):
             return profile.first_name
         return self.email.split('@')[0]
     
+    @cached_property
+    def profile(self):
+        """The related profile object based on role, resolved once per instance"""
+        profile_attr = self.PROFILE_ATTRS.get(self.role)
+        return getattr(self, profile_attr, None) if profile_attr else None
+    
     def get_profile(self):
         """Get the related profile object based on role"""
-        profile_map = {
-            self.TEACHER: 'teacher',
-            self.STUDENT: 'student',
-            self.PARENT: 'parent',
-        }
-        profile_attr = profile_map.get(self.role)
-        return getattr(self, profile_attr, None) if profile_attr else None
+        return self.profile
     
     @property
     def is_staff(self):
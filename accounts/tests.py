@@ -1,3 +1,40 @@
-from django.test import TestCase
+from accounts.backend import MultiTenantAuthBackend
+from accounts.models import User
+from schools.tests import SchoolTestCase
 
-# Create your tests here.
+
+class CachedUserTests(SchoolTestCase):
+    """The auth backend's cached user row must not outlive a deactivation"""
+
+    def setUp(self):
+        """Set up a student and load it into the backend's cache"""
+        super().setUp()
+        self.backend = MultiTenantAuthBackend()
+        self.student = User.objects.create_studentuser(email='student@example.com', password='testpass')
+        self.assertEqual(self.backend.get_user(self.student.pk), self.student)
+
+    def test_deactivated_user_is_rejected(self):
+        """Test that a user deactivated through save() is no longer returned"""
+        self.student.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.save()
+
+        self.assertIsNone(self.backend.get_user(self.student.pk))
+
+    def test_bulk_deactivated_user_is_rejected(self):
+        """Test that a queryset update() also clears the cached user"""
+        with self.captureOnCommitCallbacks() as callbacks:
+            User.objects.filter(pk=self.student.pk).update(is_active=False)
+            # Cleared on commit, so a concurrent request cannot re-cache the old row
+            self.assertTrue(self.backend.get_user(self.student.pk).is_active)
+        for callback in callbacks:
+            callback()
+
+        self.assertIsNone(self.backend.get_user(self.student.pk))
+
+    def test_deleted_user_is_rejected(self):
+        """Test that a queryset delete() also clears the cached user"""
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(pk=self.student.pk).delete()
+
+        self.assertIsNone(self.backend.get_user(self.student.pk))
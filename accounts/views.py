@@ -2,27 +2,25 @@
 # accounts/views.py
 # ============================================================================
 
-from django.contrib.auth import authenticate, login, logout
-from django.contrib.auth.decorators import login_required
-from django.contrib import messages
-from django.shortcuts import render, redirect
-from django.db import connection
-from schools.models import School
-from accounts.models import User
-
-
 from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.shortcuts import render, redirect
 from django.urls import reverse
 from django.http import HttpResponse
-from django.db import connection
-from schools.models import School
+from django.db import IntegrityError, connection, transaction
 from accounts.models import User
 from .forms import CustomAuthenticationForm # Import the custom form
 
 
+ROLE_DASHBOARD_TEMPLATES = {
+    User.SCHOOL_ADMIN: 'accounts/dashboard_admin.html',
+    User.TEACHER: 'accounts/dashboard_teacher.html',
+    User.STUDENT: 'accounts/dashboard_student.html',
+    User.PARENT: 'accounts/dashboard_parent.html',
+}
+
+
 def login_view(request):
     """Login view for tenant users, compatible with HTMX."""
     
@@ -74,11 +72,8 @@ def dashboard(request):
     
     user = request.user
     
-    # Get school info
-    try:
-        school = School.objects.get(schema_name=connection.schema_name)
-    except School.DoesNotExist:
-        school = None
+    # TenantMainMiddleware has already loaded the school for this schema
+    school = getattr(request, 'tenant', None)
     
     # Get user profile
     profile = user.get_profile()
@@ -89,18 +84,8 @@ def dashboard(request):
         'profile': profile,
     }
     
-    # Route to role-specific dashboard
-    if user.is_school_admin():
-        return render(request, 'accounts/dashboard_admin.html', context)
-    elif user.is_teacher():
-        return render(request, 'accounts/dashboard_teacher.html', context)
-    elif user.is_student():
-        return render(request, 'accounts/dashboard_student.html', context)
-    elif user.is_parent():
-        return render(request, 'accounts/dashboard_parent.html', context)
-    
-    # Fallback
-    return render(request, 'accounts/dashboard.html', context)
+    # Route to role-specific dashboard, falling back to the generic one
+    return render(request, ROLE_DASHBOARD_TEMPLATES.get(user.role, 'accounts/dashboard.html'), context)
 
 
 @login_required(login_url='accounts:login')
@@ -110,10 +95,7 @@ def profile_view(request):
     user = request.user
     profile = user.get_profile()
     
-    try:
-        school = School.objects.get(schema_name=connection.schema_name)
-    except School.DoesNotExist:
-        school = None
+    school = getattr(request, 'tenant', None)
     
     context = {
         'user': user,
@@ -136,14 +118,21 @@ def profile_edit(request):
         email = request.POST.get('email')
         
         if email and email != user.email:
-            # Check if email already exists
+            # Check if email already exists (a probe of the unique email index)
             if User.objects.filter(email=email).exclude(pk=user.pk).exists():
                 messages.error(request, 'This email is already in use.')
             else:
-                user.email = email
-                user.save()
-                messages.success(request, 'Profile updated successfully.')
-                return redirect('accounts:profile')
+                previous_email, user.email = user.email, email
+                try:
+                    with transaction.atomic():
+                        user.save(update_fields=['email'])
+                except IntegrityError:
+                    # Claimed by another account since the check above
+                    user.email = previous_email
+                    messages.error(request, 'This email is already in use.')
+                else:
+                    messages.success(request, 'Profile updated successfully.')
+                    return redirect('accounts:profile')
     
     context = {
         'user': user,
@@ -173,12 +162,14 @@ def change_password(request):
         else:
             # Update password
             user.set_password(new_password)
+            update_fields = ['password']
 
             # Clear force_password_change flag if it exists
             if hasattr(user, 'force_password_change'):
                 user.force_password_change = False
+                update_fields.append('force_password_change')
 
-            user.save()
+            user.save(update_fields=update_fields)
 
             # Update session to prevent logout
             from django.contrib.auth import update_session_auth_hash
@@ -73,7 +73,6 @@ MIDDLEWARE = [
     'accounts.middleware.ForcePasswordChangeMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'accounts.middleware.BlockSchoolAdminMiddleware',
 ]
 
 if DEBUG:
@@ -82,6 +81,7 @@ if DEBUG:
         "django_browser_reload.middleware.BrowserReloadMiddleware",
     ]
 
+# Admin is only routed in the public URLconf, so /admin/ 404s on school domains
 ROOT_URLCONF = 'config.urls'
 PUBLIC_SCHEMA_URLCONF = 'config.urls_public'
 
@@ -116,6 +116,9 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASS', 'devpass'),
         'HOST': os.getenv('DB_HOST', 'db'),
         'PORT': os.getenv('DB_PORT', '5432'),
+        # Reuse connections across requests; django-tenants sets search_path per request
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
         'OPTIONS': {
             'options': '-c search_path=public'  # Default schema
         },
@@ -147,6 +150,17 @@ PUBLIC_SCHEMA_NAME = 'public'
 # Auto-create public schema on migrate
 TENANT_CREATION_FAKES_MIGRATIONS = False
 
+# Password hashing
+# https://docs.djangoproject.com/en/5.2/topics/auth/passwords/#using-argon2-with-django
+# New hashes use Argon2; existing PBKDF2 hashes are upgraded on the next login
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -206,6 +220,18 @@ STATICFILES_DIRS = [
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+# Cache Configuration
+# Keys are prefixed with the tenant schema so cached lookups never leak between schools
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('CACHE_URL', 'redis://redis:6379/1'),
+        'KEY_FUNCTION': 'django_tenants.cache.make_key',
+        'REVERSE_KEY_FUNCTION': 'django_tenants.cache.reverse_key',
+    }
+}
+
+
 # Celery Configuration
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://redis:6379/0')
 CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', 'redis://redis:6379/0')
@@ -39,7 +39,7 @@ def main_partial_view(request):
         ]
 
         # Get current academic year
-        current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+        current_academic_year = AcademicYear.objects.current()
 
         # Calculate real statistics
         total_students = Student.objects.filter(is_active=True).count()
@@ -142,16 +142,10 @@ def settings_view(request):
     school_settings = SchoolSettings.get_settings()
     school_form = SchoolSettingsForm(instance=school_settings)
 
-    academic_years = AcademicYear.objects.annotate(
-        term_count=Count('terms'),
-        enrollment_count=Count('enrollments')
-    )
-    terms = Term.objects.select_related('academic_year').order_by('-academic_year__start_date', 'term_number')
-    grade_levels = GradeLevel.objects.annotate(class_count=Count('classes'))
-    programmes = Programme.objects.annotate(
-        class_count=Count('classes'),
-        subject_count=Count('subjects')
-    )
+    academic_years = AcademicYear.objects.with_counts()
+    terms = Term.objects.cached_list()
+    grade_levels = GradeLevel.objects.with_class_count()
+    programmes = Programme.objects.with_counts()
     grading_scales = GradeScale.objects.prefetch_related('levels').order_by('level_type', 'name')
     assessment_types = AssessmentType.objects.order_by('order', 'name')
 
@@ -222,10 +216,7 @@ def settings_school_info_view(request):
 @login_required
 def settings_academic_years_view(request):
     """Return academic years tab content"""
-    academic_years = AcademicYear.objects.annotate(
-        term_count=Count('terms'),
-        enrollment_count=Count('enrollments')
-    )
+    academic_years = AcademicYear.objects.with_counts()
     context = {'academic_years': academic_years}
 
     if request.htmx:
@@ -236,7 +227,7 @@ def settings_academic_years_view(request):
 @login_required
 def settings_terms_view(request):
     """Return terms tab content"""
-    terms = Term.objects.select_related('academic_year').order_by('-academic_year__start_date', 'term_number')
+    terms = Term.objects.cached_list()
     academic_years = AcademicYear.objects.filter(is_active=True)
     context = {
         'terms': terms,
@@ -251,7 +242,7 @@ def settings_terms_view(request):
 @login_required
 def settings_grade_levels_view(request):
     """Return grade levels tab content"""
-    grade_levels = GradeLevel.objects.annotate(class_count=Count('classes'))
+    grade_levels = GradeLevel.objects.with_class_count()
     context = {'grade_levels': grade_levels}
 
     if request.htmx:
@@ -262,10 +253,7 @@ def settings_grade_levels_view(request):
 @login_required
 def settings_programmes_view(request):
     """Return programmes tab content"""
-    programmes = Programme.objects.annotate(
-        class_count=Count('classes'),
-        subject_count=Count('subjects')
-    )
+    programmes = Programme.objects.with_counts()
     context = {'programmes': programmes}
 
     if request.htmx:
@@ -194,7 +194,7 @@ def assessment_detail_view(request, pk):
         class_instance=class_instance,
         academic_year=academic_year,
         is_active=True
-    ).select_related('student__user').order_by('student__last_name', 'student__first_name')
+    ).select_related('student__user').defer('notes').order_by('student__last_name', 'student__first_name')
 
     # Get existing grades for this assessment
     grades = {g.student_id: g for g in assessment.grades.select_related('student')}
@@ -345,7 +345,7 @@ def grade_entry_view(request, assessment_pk):
         class_instance=class_instance,
         academic_year=academic_year,
         is_active=True
-    ).select_related('student__user').order_by('student__last_name', 'student__first_name')
+    ).select_related('student__user').defer('notes').order_by('student__last_name', 'student__first_name')
 
     # Get existing grades
     existing_grades = {g.student_id: g for g in assessment.grades.all()}
@@ -1,3 +1,33 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import override_settings
+from django_tenants.test.cases import TenantTestCase
+from django_tenants.test.client import TenantClient
 
-# Create your tests here.
+from accounts.models import User
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class SchoolTestCase(TenantTestCase):
+    """
+    Base test case for tenant apps.
+    Runs each test inside a school schema, on a local cache, with the
+    school administrator logged in through the school's domain.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        """Fill in the School fields the test tenant needs"""
+        tenant.name = 'Test School'
+        tenant.short_name = cls.get_test_schema_name()
+        tenant.school_code = 'TEST'
+        tenant.email = 'school@example.com'
+
+    def setUp(self):
+        """Set up a logged-in school administrator"""
+        cache.clear()
+        self.user = User.objects.create_school_adminuser(
+            email='admin@example.com',
+            password='testpass123'
+        )
+        self.client = TenantClient(self.tenant)
+        self.client.force_login(self.user)
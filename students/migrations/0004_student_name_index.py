@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-16 07:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0008_enrollment_class_and_subject_active_indexes'),
+        ('accounts', '0002_user_force_password_change'),
+        ('students', '0003_student_graduation_date_student_graduation_year_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['last_name', 'first_name'], name='students_last_na_08ef26_idx'),
+        ),
+    ]
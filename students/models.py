@@ -110,6 +110,7 @@ class Student(models.Model):
         ordering = ['last_name', 'first_name']
         indexes = [
             models.Index(fields=['student_id']),
+            models.Index(fields=['last_name', 'first_name']),
             models.Index(fields=['current_class', 'is_active']),
             models.Index(fields=['admission_date']),
             models.Index(fields=['residential_status', 'is_active']),
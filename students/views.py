@@ -1,7 +1,7 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.urls import reverse
-from django.db import models
+from django.db import models, transaction
 from django.http import HttpResponse
 from django.contrib import messages
 from .models import Student, Parent
@@ -133,7 +133,7 @@ def student_detail_view(request, pk):
             'academic_year',
             'promoted_from__class_instance',
             'promoted_from__academic_year'
-        ).order_by('-academic_year__start_date')
+        ).defer('notes').order_by('-academic_year__start_date')
     except ImportError:
         enrollment_history = []
 
@@ -244,7 +244,13 @@ def student_delete_view(request, pk):
     student = get_object_or_404(Student, pk=pk)
 
     if request.method == 'POST':
-        student.user.delete()  # Deletes the associated User and cascades to Student
+        from academics.models import Class
+
+        with transaction.atomic():
+            class_pks = list(student.class_enrollments.values_list('class_instance_id', flat=True))
+            student.user.delete()  # Deletes the associated User and cascades to Student
+            # Cascaded enrollment deletes skip ClassEnrollment.delete()
+            Class.objects.filter(pk__in=class_pks).refresh_enrollment_counts()
 
         # If HTMX request, return the student list
         if request.htmx:
@@ -404,19 +410,13 @@ def student_export_pdf_view(request, pk):
     Render a print-friendly student profile page.
     Users can use browser's Print > Save as PDF functionality.
     """
-    from django.db import connection
-    from schools.models import School
-
     student = get_object_or_404(
         Student.objects.select_related('user', 'current_class').prefetch_related('parents'),
         pk=pk
     )
 
-    # Get school info for header
-    try:
-        school = School.objects.get(schema_name=connection.schema_name)
-    except School.DoesNotExist:
-        school = None
+    # School info for the header; TenantMainMiddleware has already loaded it
+    school = getattr(request, 'tenant', None)
 
     # Fetch enrollment history
     try:
@@ -427,7 +427,7 @@ def student_export_pdf_view(request, pk):
             'class_instance__grade_level',
             'class_instance__programme',
             'academic_year'
-        ).order_by('-academic_year__start_date')
+        ).defer('notes').order_by('-academic_year__start_date')
     except ImportError:
         enrollment_history = []
 
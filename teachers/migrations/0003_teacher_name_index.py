@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 07:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_user_force_password_change'),
+        ('teachers', '0002_add_subject_and_class_subject'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='teacher',
+            index=models.Index(fields=['last_name', 'first_name'], name='teachers_last_na_0e6b74_idx'),
+        ),
+    ]
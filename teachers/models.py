@@ -84,6 +84,7 @@ class Teacher(models.Model):
         ordering = ['last_name', 'first_name']
         indexes = [
             models.Index(fields=['staff_id']),
+            models.Index(fields=['last_name', 'first_name']),
             models.Index(fields=['is_active']),
             models.Index(fields=['employment_status', 'is_active']),
         ]